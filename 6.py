@@ -1,124 +1,217 @@
-import tkinter as tk
-from tkinter import messagebox
-from tkinter import ttk
-
-# TreeNode class for hierarchical categories with more fields (e.g., "Name", "Description", "Price Range")
-class TreeNode:
-    def __init__(self, name, description="", price_range=""):
-        self.name = name
-        self.description = description
-        self.price_range = price_range
-        self.children = []
-
-    def add_child(self, child):
-        self.children.append(child)
-
-# HierarchicalTree class to handle categories
-class HierarchicalTree:
-    def __init__(self):
-        self.root = TreeNode("All Orders")
-        self.category_nodes = {"All Orders": self.root}
-
-    def add_category(self, parent, name, description, price_range):
-        new_node = TreeNode(name, description, price_range)
-        parent.add_child(new_node)
-        self.category_nodes[name] = new_node
-        return new_node
-
-    def display_tree(self, node, parent_item=""):
-        if node is not None:
-            parent_item = tree_view.insert(parent_item, "end", text=node.name, open=True)
-            tree_view.item(parent_item, values=(node.description, node.price_range))  # Show description and price range
-            for child in node.children:
-                self.display_tree(child, parent_item)
-
-# Main application class
-class AVLTreeApp:
-    def __init__(self):
-        self.hierarchical_tree = HierarchicalTree()
-        self.window = tk.Tk()
-        self.window.title("T-Shirt Order System")
-        self.window.state('zoomed')  # Maximize the window
-        self.window.config(bg="#f4f4f9")
-        self.create_widgets()
-        self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
-
-    def create_widgets(self):
-        # Input fields for category details
-        self.label_category_name = tk.Label(self.window, text="Category Name:", bg="#f4f4f9", font=("Arial", 12))
-        self.label_category_name.grid(row=0, column=0, padx=10, pady=10)
-        self.entry_category_name = tk.Entry(self.window, font=("Arial", 12))
-        self.entry_category_name.grid(row=0, column=1, padx=10, pady=10)
-
-        self.label_description = tk.Label(self.window, text="Description:", bg="#f4f4f9", font=("Arial", 12))
-        self.label_description.grid(row=1, column=0, padx=10, pady=10)
-        self.entry_description = tk.Entry(self.window, font=("Arial", 12))
-        self.entry_description.grid(row=1, column=1, padx=10, pady=10)
-
-        self.label_price_range = tk.Label(self.window, text="Price Range:", bg="#f4f4f9", font=("Arial", 12))
-        self.label_price_range.grid(row=2, column=0, padx=10, pady=10)
-        self.entry_price_range = tk.Entry(self.window, font=("Arial", 12))
-        self.entry_price_range.grid(row=2, column=1, padx=10, pady=10)
-
-        # Parent category selector
-        self.label_parent_category = tk.Label(self.window, text="Parent Category:", bg="#f4f4f9", font=("Arial", 12))
-        self.label_parent_category.grid(row=3, column=0, padx=10, pady=10)
-        self.parent_category_combobox = ttk.Combobox(self.window, font=("Arial", 12))
-        self.parent_category_combobox.grid(row=3, column=1, padx=10, pady=10)
-        self.parent_category_combobox['values'] = ['All Orders']  # Default value is only the root
-        self.parent_category_combobox.set('All Orders')  # Default value
-
-        # Button to add new category
-        self.add_category_button = tk.Button(self.window, text="Add Category", command=self.add_category, font=("Arial", 12), bg="#4CAF50", fg="white")
-        self.add_category_button.grid(row=4, column=0, columnspan=2, pady=20)
-
-        # Treeview to display hierarchical data
-        global tree_view
-        tree_view = ttk.Treeview(self.window, columns=("Description", "Price Range"), height=10)
-        tree_view.heading("Description", text="Description")
-        tree_view.heading("Price Range", text="Price Range")
-        tree_view.grid(row=5, column=0, columnspan=2, pady=20, padx=10, sticky="nsew")
-
-        # Display initial hierarchical structure
-        self.hierarchical_tree.display_tree(self.hierarchical_tree.root)
-
-    def add_category(self):
-        category_name = self.entry_category_name.get()
-        description = self.entry_description.get()
-        price_range = self.entry_price_range.get()
-        parent_category = self.parent_category_combobox.get()
-
-        if category_name and description and price_range:
-            if parent_category == 'All Orders':
-                parent_node = self.hierarchical_tree.root
-            else:
-                parent_node = self.get_category_node(parent_category)
-
-            if parent_node:
-                new_node = self.hierarchical_tree.add_category(parent_node, category_name, description, price_range)
-                self.hierarchical_tree.display_tree(self.hierarchical_tree.root)  # Refresh the tree display
-                self.update_parent_category_combobox()  # Update the parent category combobox
-            else:
-                messagebox.showwarning("Parent Not Found", "The selected parent category does not exist.")
-        else:
-            messagebox.showwarning("Input Error", "Please fill in all the fields")
-
-    def get_category_node(self, category_name):
-        # Return the category node from the hierarchical tree
-        return self.hierarchical_tree.category_nodes.get(category_name)
-
-    def update_parent_category_combobox(self):
-        # Update the parent category combobox with all existing categories
-        self.parent_category_combobox['values'] = list(self.hierarchical_tree.category_nodes.keys())
-
-    def on_closing(self):
-        if messagebox.askyesno("Quit", "Do you want to quit?"):
-            self.window.destroy()
-
-    def run(self):
-        self.window.mainloop()
-
-# Run the application
-if __name__ == "__main__":
-    app = AVLTreeApp()
-    app.run()
+import os
+import tkinter as tk
+from tkinter import messagebox
+from tkinter import ttk
+
+from order_core.categories import HierarchicalTree
+from order_core.order_journal import CATEGORY, CATEGORY_MOVE, CATEGORY_REMOVE, OrderJournal
+
+# Categories are journaled here so they survive a restart
+DATA_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "orders_data", "topic6")
+
+# Main application class
+class AVLTreeApp:
+    def __init__(self):
+        self.hierarchical_tree = HierarchicalTree()
+        self.journal = OrderJournal(DATA_DIRECTORY, snapshot_source=self.snapshot_records)
+        self.restore_categories()
+        self.hierarchical_tree.subscribe(self.log_change)
+        self.window = tk.Tk()
+        self.window.title("T-Shirt Order System")
+        self.window.state('zoomed')  # Maximize the window
+        self.window.config(bg="#f4f4f9")
+        self.create_widgets()
+        self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+    def create_widgets(self):
+        # Input fields for category details
+        self.label_category_name = tk.Label(self.window, text="Category Name:", bg="#f4f4f9", font=("Arial", 12))
+        self.label_category_name.grid(row=0, column=0, padx=10, pady=10)
+        self.entry_category_name = tk.Entry(self.window, font=("Arial", 12))
+        self.entry_category_name.grid(row=0, column=1, padx=10, pady=10)
+
+        self.label_description = tk.Label(self.window, text="Description:", bg="#f4f4f9", font=("Arial", 12))
+        self.label_description.grid(row=1, column=0, padx=10, pady=10)
+        self.entry_description = tk.Entry(self.window, font=("Arial", 12))
+        self.entry_description.grid(row=1, column=1, padx=10, pady=10)
+
+        self.label_price_range = tk.Label(self.window, text="Price Range:", bg="#f4f4f9", font=("Arial", 12))
+        self.label_price_range.grid(row=2, column=0, padx=10, pady=10)
+        self.entry_price_range = tk.Entry(self.window, font=("Arial", 12))
+        self.entry_price_range.grid(row=2, column=1, padx=10, pady=10)
+
+        # Parent category selector
+        self.label_parent_category = tk.Label(self.window, text="Parent Category:", bg="#f4f4f9", font=("Arial", 12))
+        self.label_parent_category.grid(row=3, column=0, padx=10, pady=10)
+        self.parent_category_combobox = ttk.Combobox(self.window, font=("Arial", 12), postcommand=self.update_parent_category_combobox)
+        self.parent_category_combobox.grid(row=3, column=1, padx=10, pady=10)
+        self.parent_category_combobox['values'] = ['All Orders']  # Default value is only the root
+        self.parent_category_combobox.set('All Orders')  # Default value
+
+        # Button to add new category
+        self.add_category_button = tk.Button(self.window, text="Add Category", command=self.add_category, font=("Arial", 12), bg="#4CAF50", fg="white")
+        self.add_category_button.grid(row=4, column=0, columnspan=2, pady=20)
+
+        # Buttons to remove the selected category or move it under the chosen parent
+        self.remove_category_button = tk.Button(self.window, text="Remove Selected", command=self.remove_selected_category, font=("Arial", 12), bg="#f44336", fg="white")
+        self.remove_category_button.grid(row=4, column=2, padx=10, pady=20)
+        self.move_category_button = tk.Button(self.window, text="Move Selected to Parent", command=self.move_selected_category, font=("Arial", 12), bg="#2196F3", fg="white")
+        self.move_category_button.grid(row=4, column=3, padx=10, pady=20)
+
+        # Treeview to display hierarchical data
+        self.tree_view = ttk.Treeview(self.window, columns=("Description", "Price Range"), height=10)
+        self.tree_view.heading("Description", text="Description")
+        self.tree_view.heading("Price Range", text="Price Range")
+        self.tree_view.grid(row=5, column=0, columnspan=4, pady=20, padx=10, sticky="nsew")
+
+        # Display initial hierarchical structure, then keep it in sync from tree events
+        self.tree_items = {}  # TreeNode -> Treeview item id
+        self.item_nodes = {}  # Treeview item id -> TreeNode
+        self.category_labels = {}  # TreeNode -> parent combobox label
+        self.display_tree()
+        self.hierarchical_tree.subscribe(self.on_tree_change)
+
+    def insert_item(self, node, parent_item):
+        item = self.tree_view.insert(parent_item, "end", text=node.name, open=True, values=(node.description, node.price_range))  # Show description and price range
+        self.tree_items[node] = item
+        self.item_nodes[item] = node
+        self.category_labels[node] = self.category_label(node)
+        return item
+
+    def display_tree(self):
+        # Full repaint of the hierarchy (only done at start-up)
+        rows = self.tree_view.get_children()
+        if rows:
+            self.tree_view.delete(*rows)
+        self.tree_items = {}
+        self.item_nodes = {}
+        self.category_labels = {}
+
+        stack = [(self.hierarchical_tree.root, "")]
+        while stack:
+            node, parent_item = stack.pop()
+            item = self.insert_item(node, parent_item)
+            stack.extend((child, item) for child in reversed(node.children))
+
+    def on_tree_change(self, event, node, parent):
+        # Apply one hierarchy change to the Treeview, touching only the affected item
+        if event == "add":
+            self.insert_item(node, self.tree_items[parent])
+        elif event == "remove":
+            self.tree_view.delete(self.tree_items[node])
+            for removed in self.hierarchical_tree.walk(node):
+                del self.item_nodes[self.tree_items.pop(removed)]
+                del self.category_labels[removed]
+        elif event == "move":
+            self.tree_view.move(self.tree_items[node], self.tree_items[parent], "end")
+
+    def add_category(self):
+        category_name = self.entry_category_name.get()
+        description = self.entry_description.get()
+        price_range = self.entry_price_range.get()
+        parent_category = self.parent_category_combobox.get()
+
+        if category_name and description and price_range:
+            if parent_category == 'All Orders':
+                parent_node = self.hierarchical_tree.root
+            else:
+                parent_node = self.get_category_node(parent_category)
+
+            if parent_node:
+                self.hierarchical_tree.add_category(parent_node, category_name, description, price_range)  # The tree display and parent labels update themselves
+            else:
+                messagebox.showwarning("Parent Not Found", "The selected parent category does not exist.")
+        else:
+            messagebox.showwarning("Input Error", "Please fill in all the fields")
+
+    def selected_category(self):
+        selection = self.tree_view.selection()
+        if not selection:
+            messagebox.showwarning("No Selection", "Please select a category in the tree first.")
+            return None
+        return self.item_nodes[selection[0]]
+
+    def remove_selected_category(self):
+        node = self.selected_category()
+        if node is None:
+            return
+        try:
+            self.hierarchical_tree.remove_category(node)
+        except ValueError as ve:
+            messagebox.showerror("Remove Category", str(ve))
+
+    def move_selected_category(self):
+        node = self.selected_category()
+        if node is None:
+            return
+        parent_category = self.parent_category_combobox.get()
+        if parent_category == 'All Orders':
+            new_parent = self.hierarchical_tree.root
+        else:
+            new_parent = self.get_category_node(parent_category)
+        if new_parent is None:
+            messagebox.showwarning("Parent Not Found", "The selected parent category does not exist.")
+            return
+        try:
+            self.hierarchical_tree.move_category(node, new_parent)
+        except ValueError as ve:
+            messagebox.showerror("Move Category", str(ve))
+
+    def category_label(self, node):
+        # Combobox label; the ID keeps categories with the same name apart
+        if node is self.hierarchical_tree.root:
+            return node.name
+        return f"{node.name} (#{node.category_id})"
+
+    def get_category_node(self, category_name):
+        # Return the category node from the hierarchical tree, by label or by a unique name
+        if category_name.endswith(")") and " (#" in category_name:
+            category_id = category_name[category_name.rindex(" (#") + 3:-1]
+            if category_id.isdigit():
+                return self.hierarchical_tree.categories.get(int(category_id))
+        nodes = self.hierarchical_tree.category_nodes.get(category_name, [])
+        return nodes[0] if len(nodes) == 1 else None
+
+    def update_parent_category_combobox(self):
+        # Called when the drop-down opens: tree events keep category_labels up to date one label
+        # at a time, so adding or removing a category never rebuilds the list
+        self.parent_category_combobox['values'] = list(self.category_labels.values())
+
+    def restore_categories(self):
+        # Snapshot categories come parents-first, so each parent exists before its children
+        snapshot, tail = self.journal.recover()
+        categories = self.hierarchical_tree.categories
+        for record in snapshot + tail:
+            if record.kind == CATEGORY:
+                self.hierarchical_tree.add_category(categories[record.extra], *record.fields, category_id=record.key)
+            elif record.kind == CATEGORY_REMOVE:
+                self.hierarchical_tree.remove_category(categories[record.key])
+            elif record.kind == CATEGORY_MOVE:
+                self.hierarchical_tree.move_category(categories[record.key], categories[record.extra])
+
+    def log_change(self, event, node, parent):
+        if event == "add":
+            self.journal.log(CATEGORY, node.category_id, parent.category_id, (node.name, node.description, node.price_range))
+        elif event == "remove":
+            self.journal.log(CATEGORY_REMOVE, node.category_id)
+        elif event == "move":
+            self.journal.log(CATEGORY_MOVE, node.category_id, parent.category_id)
+
+    def snapshot_records(self):
+        root = self.hierarchical_tree.root
+        for node in self.hierarchical_tree.walk(root):
+            if node is not root:
+                yield CATEGORY, node.category_id, node.parent.category_id, (node.name, node.description, node.price_range)
+
+    def on_closing(self):
+        if messagebox.askyesno("Quit", "Do you want to quit?"):
+            self.journal.close()
+            self.window.destroy()
+
+    def run(self):
+        self.window.mainloop()
+
+# Run the application
+if __name__ == "__main__":
+    app = AVLTreeApp()
+    app.run()
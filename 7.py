@@ -1,99 +1,195 @@
-import tkinter as tk
-from tkinter import messagebox
-from tkinter import ttk
-
-# Define Order class with attributes like order_id, customer_name, priority
-class Order:
-    def __init__(self, order_id, customer_name, priority):
-        self.order_id = order_id
-        self.customer_name = customer_name
-        self.priority = priority
-
-# Merge Sort function to sort orders by priority
-def merge_sort(orders):
-    if len(orders) > 1:
-        mid = len(orders) // 2  # Find the middle point
-        left_half = orders[:mid]
-        right_half = orders[mid:]
-
-        # Recursively split and sort the halves
-        merge_sort(left_half)
-        merge_sort(right_half)
-
-        i = j = k = 0
-
-        # Merge the two halves
-        while i < len(left_half) and j < len(right_half):
-            if left_half[i].priority < right_half[j].priority:  # Sort in descending order
-                orders[k] = left_half[i]
-                i += 1
-            else:
-                orders[k] = right_half[j]
-                j += 1
-            k += 1
-
-        # If there are remaining elements in left_half
-        while i < len(left_half):
-            orders[k] = left_half[i]
-            i += 1
-            k += 1
-
-        # If there are remaining elements in right_half
-        while j < len(right_half):
-            orders[k] = right_half[j]
-            j += 1
-            k += 1
-
-# Main application class
-class AVLTreeApp:
-    def __init__(self):
-        self.window = tk.Tk()
-        self.window.title("T-Shirt Order System")
-        self.window.state('zoomed')  # Maximize the window
-        self.window.config(bg="#f4f4f9")
-        self.orders = [
-            Order(101, "Alice", 2),
-            Order(102, "Bob", 5),
-            Order(103, "Charlie", 3),
-            Order(104, "David", 1),
-            Order(105, "Eve", 4)
-        ]
-        self.create_widgets()
-        self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
-
-    def create_widgets(self):
-        # Display Orders Button
-        self.display_orders_button = tk.Button(self.window, text="Display Sorted Orders", command=self.display_sorted_orders, font=("Arial", 12), bg="#4CAF50", fg="white")
-        self.display_orders_button.grid(row=0, column=0, pady=20)
-
-        # Treeview to display sorted orders
-        global tree_view
-        tree_view = ttk.Treeview(self.window, columns=("Order ID", "Customer Name", "Priority"), height=10)
-        tree_view.heading("Order ID", text="Order ID")
-        tree_view.heading("Customer Name", text="Customer Name")
-        tree_view.heading("Priority", text="Priority")
-        tree_view.grid(row=1, column=0, columnspan=2, pady=20, padx=10, sticky="nsew")
-
-    def display_sorted_orders(self):
-        # Sort orders based on priority using Merge Sort
-        merge_sort(self.orders)
-
-        # Clear the treeview before displaying
-        for row in tree_view.get_children():
-            tree_view.delete(row)
-
-        # Insert sorted orders into the treeview
-        for order in self.orders:
-            tree_view.insert("", "end", values=(order.order_id, order.customer_name, order.priority))
-
-    def on_closing(self):
-        if messagebox.askyesno("Quit", "Do you want to quit?"):
-            self.window.destroy()
-
-    def run(self):
-        self.window.mainloop()
-
-# Run the application
-if __name__ == "__main__":
-    app = AVLTreeApp()
-    app.run()
+import csv
+import os
+import queue
+import sys
+import threading
+import tkinter as tk
+from tkinter import filedialog
+from tkinter import messagebox
+from tkinter import ttk
+
+from order_core.dispatch import Order, OrderDispatchQueue
+from order_core.external_sort import external_sort
+from order_core.order_journal import EVICT, INSERT, OrderJournal
+from order_core.order_sort import keyed_sort
+from order_table import VirtualOrderTable
+
+# Waiting orders and dispatches are journaled here so they survive a restart
+DATA_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "orders_data", "topic7")
+
+# Main application class
+class AVLTreeApp:
+    def __init__(self, virtual=False):
+        self.virtual = virtual  # Page rows in from the order list instead of one Treeview row per order
+        self.window = tk.Tk()
+        self.window.title("T-Shirt Order System")
+        self.window.state('zoomed')  # Maximize the window
+        self.window.config(bg="#f4f4f9")
+        self.orders = [
+            Order(101, "Alice", 2),
+            Order(102, "Bob", 5),
+            Order(103, "Charlie", 3),
+            Order(104, "David", 1),
+            Order(105, "Eve", 4)
+        ]
+        self.journal = OrderJournal(DATA_DIRECTORY, snapshot_source=self.snapshot_records)
+        self.restore_orders()
+        self.orders_sorted = False  # Set back to False whenever self.orders changes
+        self.dispatched = 0  # Orders at the front of the sorted list that have been dispatched
+        self.rows = {}  # order_id -> Treeview item currently showing it
+        self.dispatch_queue = OrderDispatchQueue(self.orders)
+        self.create_widgets()
+        self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+    def create_widgets(self):
+        # Display Orders Button
+        self.display_orders_button = tk.Button(self.window, text="Display Sorted Orders", command=self.display_sorted_orders, font=("Arial", 12), bg="#4CAF50", fg="white")
+        self.display_orders_button.grid(row=0, column=0, pady=20)
+
+        # Dispatch Next Order Button
+        self.dispatch_button = tk.Button(self.window, text="Dispatch Next Order", command=self.dispatch_next_order, font=("Arial", 12), bg="#2196F3", fg="white")
+        self.dispatch_button.grid(row=0, column=1, pady=20)
+
+        # Priority Report Button: sorts an order CSV of any size into a new CSV
+        self.report_button = tk.Button(self.window, text="Priority Report", command=self.export_report, font=("Arial", 12), bg="#FF9800", fg="white")
+        self.report_button.grid(row=0, column=2, pady=20)
+
+        # Treeview to display sorted orders
+        if self.virtual:
+            self.table = VirtualOrderTable(self.window, ("Order ID", "Customer Name", "Priority"), self.fetch_rows, lambda: len(self.orders) - self.dispatched)
+            self.table.grid(row=1, column=0, columnspan=3, pady=20, padx=10, sticky="nsew")
+            return
+
+        global tree_view
+        tree_view = ttk.Treeview(self.window, columns=("Order ID", "Customer Name", "Priority"), height=10)
+        tree_view.heading("Order ID", text="Order ID")
+        tree_view.heading("Customer Name", text="Customer Name")
+        tree_view.heading("Priority", text="Priority")
+        tree_view.grid(row=1, column=0, columnspan=3, pady=20, padx=10, sticky="nsew")
+
+    def display_sorted_orders(self):
+        # Sort orders by priority, highest first (stable, so ties keep their original order);
+        # the list stays sorted until it changes, so repeated clicks do not re-sort it
+        if not self.orders_sorted:
+            keyed_sort(self.orders, descending=True)
+            self.orders_sorted = True
+
+        if self.virtual:
+            self.table.invalidate()
+            return
+
+        # Clear the treeview before displaying
+        rows = tree_view.get_children()
+        if rows:
+            tree_view.delete(*rows)
+
+        # Insert the waiting orders into the treeview
+        self.rows = {}
+        for order in self.orders[self.dispatched:]:
+            self.rows[order.order_id] = tree_view.insert("", "end", values=(order.order_id, order.customer_name, order.priority))
+
+    def dispatch_next_order(self):
+        order = self.dispatch_queue.pop_highest()
+        if order is None:
+            messagebox.showinfo("Dispatch", "There are no orders waiting.")
+            return
+
+        # The sorted list is in dispatch order (priority, then arrival), so the dispatched order is
+        # its first waiting one: step past it, and drop the dispatched prefix once it is half the
+        # list, which keeps each dispatch O(1) amortized on top of the heap's O(log n)
+        if not self.orders_sorted:
+            self.display_sorted_orders()
+        self.dispatched += 1
+        if self.dispatched * 2 > len(self.orders):
+            del self.orders[:self.dispatched]
+            self.dispatched = 0
+        self.journal.log(EVICT, order.order_id)
+
+        # Only the dispatched order's row changes
+        if self.virtual:
+            self.table.invalidate()
+        else:
+            tree_view.delete(self.rows.pop(order.order_id))
+        messagebox.showinfo("Dispatch", f"Next order: ID {order.order_id}, {order.customer_name}, priority {order.priority}")
+
+    def export_report(self):
+        source = filedialog.askopenfilename(title="Orders to Report", filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not source:
+            return
+        target = filedialog.asksaveasfilename(title="Save Priority Report", defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        if not target:
+            return
+        outcome = queue.Queue(1)
+        threading.Thread(target=self.write_report, args=(source, target, outcome), daemon=True).start()
+        self.window.after(200, self.report_finished, outcome)
+
+    def write_report(self, source, target, outcome):
+        # Worker thread: one order per CSV row (order ID, customer name, priority), highest priority
+        # first; the external sort keeps memory bounded however many rows the file has. Rows that do
+        # not parse are skipped.
+        def read_orders(f):
+            for row in csv.reader(f):
+                try:
+                    yield Order(int(row[0]), row[1].strip(), int(row[2]))
+                except (IndexError, ValueError):
+                    continue
+
+        try:
+            count = 0
+            with open(source, newline="", encoding="utf-8") as f, open(target, "w", newline="", encoding="utf-8") as out:
+                writer = csv.writer(out)
+                for order in external_sort(read_orders(f), descending=True):
+                    writer.writerow((order.order_id, order.customer_name, order.priority))
+                    count += 1
+            outcome.put(f"Wrote {count} orders to {target}")
+        except Exception as error:
+            # Unreadable files, bad encodings, malformed CSV, out-of-range fields, a dead worker
+            # pool: whatever it is, report_finished shows it instead of waiting forever
+            outcome.put(error)
+
+    def report_finished(self, outcome):
+        # GUI thread: wait for write_report without blocking the window
+        try:
+            result = outcome.get_nowait()
+        except queue.Empty:
+            self.window.after(200, self.report_finished, outcome)
+            return
+        if isinstance(result, Exception):
+            messagebox.showerror("Priority Report", str(result))
+        else:
+            messagebox.showinfo("Priority Report", result)
+
+    def fetch_rows(self, start, count):
+        # One page of the virtual table, sliced from the waiting part of the sorted order list
+        start += self.dispatched
+        return [(order.order_id, order.customer_name, order.priority) for order in self.orders[start:start + count]]
+
+    def restore_orders(self):
+        # A snapshot replaces the sample orders; the journal tail then removes dispatched ones
+        snapshot, tail = self.journal.recover()
+        if os.path.exists(self.journal.snapshot_path):
+            self.orders = [Order(record.key, record.fields[0], int(record.fields[1])) for record in snapshot]
+        dispatched = set()
+        for record in tail:
+            if record.kind == INSERT:
+                self.orders.append(Order(record.key, record.fields[0], int(record.fields[1])))
+            elif record.kind == EVICT:
+                dispatched.add(record.key)
+        self.orders = [order for order in self.orders if order.order_id not in dispatched]
+
+    def snapshot_records(self):
+        for order in self.orders[self.dispatched:]:
+            yield INSERT, order.order_id, 0, (order.customer_name, str(order.priority))
+
+    def on_closing(self):
+        if messagebox.askyesno("Quit", "Do you want to quit?"):
+            self.journal.close()
+            self.window.destroy()
+
+    def run(self):
+        self.window.mainloop()
+
+# Run the application
+if __name__ == "__main__":
+    app = AVLTreeApp(virtual="--virtual" in sys.argv)
+    app.run()
@@ -0,0 +1,618 @@
+import cProfile
+import importlib
+import itertools
+import json
+import os
+import platform
+import pstats
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from order_core import avl_tree, categories, compact_avl, disk_store, dispatch, external_sort, instrumentation, order_ingest, order_sort, order_tree, persistent_avl, sharded_store, window_tree
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def make_orders(count, shuffled=True):
+    orders = [(order_id, f"Customer {order_id}", f"Design {order_id % 7}") for order_id in range(1, count + 1)]
+    if shuffled:
+        random.shuffle(orders)
+    return orders
+
+
+# Bulk load and batch merge against one insert per order (3.py and 4.py AVL trees)
+def bench_bulk_load(count):
+    orders = make_orders(count)
+    pairs = [(order_id, name) for order_id, name, details in orders]
+
+    tree = avl_tree.AVLTree()
+
+    def insert_loop():
+        root = None
+        for order_id, name in pairs:
+            root = tree.insert(root, order_id, name)
+        return root
+
+    loop_time, _ = timed(insert_loop)
+    bulk_time, _ = timed(tree.bulkLoad, pairs)
+    print(f"3.py  {count:>9} orders  insert loop {loop_time:8.3f}s  bulkLoad {bulk_time:8.3f}s  ({loop_time / bulk_time:5.1f}x)")
+
+    bounded = window_tree.AVLTree()
+
+    def bounded_loop():
+        root = None
+        for order_id, name, details in orders:
+            root = bounded.insert(root, order_id, name, details, count)
+        return root
+
+    loop_time, _ = timed(bounded_loop)
+    bulk_time, root = timed(bounded.bulkLoad, orders, count)
+    print(f"4.py  {count:>9} orders  insert loop {loop_time:8.3f}s  bulkLoad {bulk_time:8.3f}s  ({loop_time / bulk_time:5.1f}x)")
+
+    # Fold in a second day's orders, half the size of the existing book
+    batch = [(order_id + count, name, details) for order_id, name, details in orders[: count // 2]]
+
+    def merge_loop(root):
+        for order_id, name, details in batch:
+            root = bounded.insert(root, order_id, name, details, 2 * count)
+        return root
+
+    loop_time, _ = timed(merge_loop, bounded.bulkLoad(orders, count))
+    merge_time, _ = timed(bounded.mergeBatch, root, batch, 2 * count)
+    print(f"4.py  {len(batch):>9} batch   insert loop {loop_time:8.3f}s  mergeBatch {merge_time:6.3f}s  ({loop_time / merge_time:5.1f}x)")
+
+
+# Replica of the original order node, which kept its fields in a per-instance __dict__
+class DictNode:
+    def __init__(self, orderID, customerName, orderDetails):
+        self.orderID = orderID
+        self.customerName = customerName
+        self.orderDetails = orderDetails
+        self.left = None
+        self.right = None
+        self.height = 1
+        self.size = 1
+
+
+def measure(build):
+    tracemalloc.start()
+    kept = build()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return used
+
+
+# Bytes per order for the __dict__ nodes, the __slots__ nodes (4.py) and the compact arena
+def bench_memory(count):
+    # Rebuild the strings for every order, the way they arrive from the entry fields or a file
+    def order_fields():
+        for order_id in range(1, count + 1):
+            yield order_id, "Customer %d" % (order_id % 1000), "Design %d" % (order_id % 7)
+
+    def build_dict_nodes():
+        nodes = [DictNode(*fields) for fields in order_fields()]
+        window_tree.AVLTree().buildBalanced(nodes, 0, len(nodes) - 1)
+        return nodes
+
+    def build_slot_nodes():
+        return window_tree.AVLTree().bulkLoad(order_fields(), count, presorted=True)
+
+    def build_compact():
+        tree = compact_avl.CompactAVLTree()
+        for fields in order_fields():
+            tree.insert(*fields)
+        return tree
+
+    for label, build in (("__dict__ Node", build_dict_nodes), ("__slots__ Node", build_slot_nodes), ("compact arena", build_compact)):
+        used = measure(build)
+        print(f"{label:<15} {count:>9} orders  {used / count:8.1f} bytes/order")
+
+
+# Refresh latency of the 5.py order table: full repaint vs. applying the insert/evict diff (needs a display)
+def bench_refresh(count, samples=50):
+    import tkinter as tk
+
+    # Only this benchmark needs the GUI, so 5.py (and Tk) are loaded here rather than at the top
+    avl5 = importlib.import_module("5")
+
+    class WindowlessApp(avl5.AVLTreeApp):
+        # Same widgets and refresh code, built in a hidden window
+        def __init__(self, window, maxOrders):
+            self.root = None
+            self.maxOrders = maxOrders
+            self.virtual = False
+            self.tree = window_tree.AVLTree()
+            self.stats = None  # No statistics panel
+            self.rows = {}
+            self.ingestor = order_ingest.OrderIngestor(self.apply_batch)  # Nothing is journaled while benchmarking
+            self.window = window
+            self.create_widgets()
+
+    window = tk.Tk()
+    window.withdraw()
+    app = WindowlessApp(window, count)
+    app.root = app.tree.bulkLoad(make_orders(count), count)
+    app.show_tree()
+
+    def repaint():
+        app.show_tree()
+        window.update_idletasks()
+
+    def apply_diff(changes):
+        app.apply_changes(changes)
+        window.update_idletasks()
+
+    repaint_time = min(timed(repaint)[0] for _ in range(3))
+
+    # The window is full, so every insert also evicts the oldest order
+    diff_time = 0.0
+    for order_id in range(count + 1, count + samples + 1):
+        changes = app.apply_batch([(order_id, f"Customer {order_id}", "Design 0")])
+        diff_time += timed(apply_diff, [changes])[0]
+    window.destroy()
+
+    print(f"refresh {count:>9} orders  full repaint {repaint_time * 1000:9.2f}ms  diff {diff_time / samples * 1000:7.3f}ms")
+
+
+# Replica of the original 7.py merge sort, which sliced both halves at every level
+def legacy_merge_sort(orders):
+    if len(orders) > 1:
+        mid = len(orders) // 2
+        left_half = orders[:mid]
+        right_half = orders[mid:]
+        legacy_merge_sort(left_half)
+        legacy_merge_sort(right_half)
+        i = j = k = 0
+        while i < len(left_half) and j < len(right_half):
+            if left_half[i].priority < right_half[j].priority:
+                orders[k] = left_half[i]
+                i += 1
+            else:
+                orders[k] = right_half[j]
+                j += 1
+            k += 1
+        while i < len(left_half):
+            orders[k] = left_half[i]
+            i += 1
+            k += 1
+        while j < len(right_half):
+            orders[k] = right_half[j]
+            j += 1
+            k += 1
+
+
+# Priority sorts from order_sort against the original merge sort, on priorities 1-5
+def bench_sort(count):
+    orders = [dispatch.Order(order_id, f"Customer {order_id}", random.randint(1, 5)) for order_id in range(count)]
+    expected = sorted(orders, key=order_sort.PRIORITY, reverse=True)
+
+    sorts = (
+        ("legacy merge_sort", legacy_merge_sort),
+        ("merge_sort", lambda data: order_sort.merge_sort(data, descending=True)),
+        ("keyed_sort", lambda data: order_sort.keyed_sort(data, descending=True)),
+        ("counting_sort", lambda data: order_sort.counting_sort(data, descending=True)),
+    )
+    for label, sort in sorts:
+        data = list(orders)
+        elapsed, _ = timed(sort, data)
+        # The legacy sort is ascending and not stable, so only the new sorts are checked
+        if label != "legacy merge_sort":
+            assert data == expected, label
+        print(f"{label:<18} {count:>9} orders  {elapsed:8.3f}s")
+
+
+# Orders-by-phone lookups on the 2.py order tree: latency should stay flat as the book grows
+def bench_phone(count, lookups=100000):
+    tree = order_tree.OrderBinaryTree()
+    phones = ["07%d%07d" % (random.choice((2, 3, 8, 9)), random.randrange(10 ** 7)) for _ in range(count // 3 + 1)]
+    checkpoints = {size for size in (1000, 10000, 100000, 1000000, 10000000) if size <= count} | {count}
+    for order_id in range(1, count + 1):
+        tree.insert(order_id, "Customer", random.choice(phones), "Classic (Medium)")
+        if order_id in checkpoints:
+            probes = [random.choice(phones) for _ in range(lookups)]
+            elapsed, _ = timed(lambda: [tree.orders_by_phone(phone) for phone in probes])
+            print(f"phone index {order_id:>9} orders  {elapsed / lookups * 1e6:6.3f}us per lookup")
+
+
+# Disk-backed B+-tree store: resident memory should stay flat while the file grows
+def bench_disk(count, lookups=10000):
+    def insert_all(store):
+        for order_id in range(1, count + 1):
+            store.insert(order_id, f"Customer {order_id}", f"Design {order_id % 7}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "orders.db")
+        store = disk_store.DiskOrderStore(path)
+        insert_time, _ = timed(insert_all, store)
+        probes = [random.randint(1, count) for _ in range(lookups)]
+        search_time, _ = timed(lambda: [store.search(order_id) for order_id in probes])
+
+        # Heap growth while another batch of the same size goes in
+        tracemalloc.start()
+        store.insert(count + 1, "Customer", "Design")
+        before = tracemalloc.get_traced_memory()[0]
+        for order_id in range(count + 2, 2 * count + 1):
+            store.insert(order_id, f"Customer {order_id}", f"Design {order_id % 7}")
+        growth = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        store.close()
+        print(f"disk store {count:>9} orders  insert {insert_time:8.3f}s  search {search_time / lookups * 1e6:7.2f}us  "
+              f"heap growth {growth / 2 ** 20:6.2f}MB  file {os.path.getsize(path) / 2 ** 20:8.1f}MB")
+
+
+# Copy-on-write AVL tree: insert overhead against the in-place tree, and the cost of a consistent
+# snapshot for a report (copying the book out of the mutable tree vs. keeping the current root)
+def bench_persistent(count):
+    orders = make_orders(count)
+
+    mutable = window_tree.AVLTree()
+    persistent = persistent_avl.PersistentAVLTree()
+
+    def mutable_loop():
+        root = None
+        for order_id, name, details in orders:
+            root = mutable.insert(root, order_id, name, details, count)
+        return root
+
+    def persistent_loop():
+        root = None
+        for order_id, name, details in orders:
+            root = persistent.insert(root, order_id, name, details)
+        return root
+
+    mutable_time, mutable_root = timed(mutable_loop)
+    persistent_time, persistent_root = timed(persistent_loop)
+    copy_time, _ = timed(lambda: list(mutable.inOrderIter(mutable_root)))
+    snapshot_time, _ = timed(lambda: persistent_root)
+    print(f"persistent {count:>9} orders  insert {mutable_time:8.3f}s in place  {persistent_time:8.3f}s copy-on-write  "
+          f"snapshot {copy_time * 1000:9.3f}ms copied  {snapshot_time * 1000:7.4f}ms shared root")
+
+
+# Instrumentation cost: the same insert loop on a plain tree, on a tree that was instrumented and
+# then uninstrumented (must match the plain one), and on an instrumented tree
+def bench_instrumented(count):
+    orders = make_orders(count)
+
+    def insert_loop(tree):
+        root = None
+        for order_id, name, details in orders:
+            root = tree.insert(root, order_id, name, details, count)
+        return root
+
+    plain_time, _ = timed(insert_loop, window_tree.AVLTree())
+    disabled = window_tree.AVLTree()
+    instrumentation.instrument(disabled)
+    instrumentation.uninstrument(disabled)
+    disabled_time, _ = timed(insert_loop, disabled)
+    enabled = window_tree.AVLTree()
+    stats = instrumentation.instrument(enabled)
+    enabled_time, root = timed(insert_loop, enabled)
+    report = stats.report(root)
+    print(f"instrumented {count:>9} orders  plain {plain_time:8.3f}s  disabled {disabled_time:8.3f}s  "
+          f"enabled {enabled_time:8.3f}s  height {report['height']} (best {report['min_height']})  "
+          f"rotations/insert {report['rotations_per_insert']['mean']:.2f}")
+
+
+# Sharded order book: insert throughput of one in-process AVLTree against 1, 2, 4, ... worker
+# shards (up to the number of cores), and the cost of a merged range query across the shards
+def bench_sharded(count):
+    orders = [(order_id, name) for order_id, name, _ in make_orders(count)]
+
+    def single_loop():
+        tree = avl_tree.AVLTree()
+        root = None
+        for order_id, name in orders:
+            root = tree.insert(root, order_id, name)
+        return root
+
+    single_time, _ = timed(single_loop)
+    print(f"sharded {count:>9} orders  single tree {count / single_time:12.0f} inserts/s")
+
+    shards = 1
+    while True:
+        store = sharded_store.ShardedOrderStore(shards)
+
+        def sharded_loop():
+            store.insertMany(orders)
+            return store.countNodes()  # Waits until every shard has applied its batches
+
+        insert_time, stored = timed(sharded_loop)
+        range_time, _ = timed(store.range, count // 4, count // 4 + 1000)
+        store.close()
+        print(f"sharded {count:>9} orders  {shards:>3} shards  {stored / insert_time:12.0f} inserts/s  "
+              f"range of 1000 {range_time * 1000:8.3f}ms")
+        if shards >= (os.cpu_count() or 1):
+            break
+        shards = min(shards * 2, os.cpu_count())
+
+
+# External merge sort against sorting the whole list in memory: time, and the peak memory of this
+# process (the input is generated lazily for the external sort, so only runs in flight count)
+def bench_external_sort(count, run_orders=100000):
+    def make_stream():
+        generator = random.Random(count)
+        return (dispatch.Order(order_id, f"Customer {order_id}", generator.randint(1, 5)) for order_id in range(count))
+
+    def in_memory():
+        orders = list(make_stream())
+        order_sort.keyed_sort(orders, descending=True)
+        return len(orders)
+
+    def external():
+        return sum(1 for _ in external_sort.external_sort(make_stream(), descending=True, run_orders=run_orders))
+
+    results = []
+    for sort in (in_memory, external):
+        tracemalloc.start()
+        elapsed, _ = timed(sort)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results.append(f"{elapsed:8.3f}s peak {peak / 2 ** 20:8.1f}MB")
+    print(f"external sort {count:>9} orders  in memory {results[0]}  external {results[1]}")
+
+
+# Headless suite: every structure, every operation, three key patterns, JSON results.
+# python benchmarks.py suite [sizes...] > results.json   (sizes default to 1e3..1e5; up to 1e7 works)
+PATTERNS = ("sequential", "random", "adversarial")
+
+# Probes per search measurement, and the largest size measured with tracemalloc (it is slow)
+SEARCH_PROBES = 100000
+MEMORY_LIMIT = 10 ** 6
+
+# A (structure, operation, pattern) that takes longer than this is skipped at larger sizes
+SKIP_AFTER = 60.0
+
+
+def key_pattern(pattern, count):
+    keys = list(range(1, count + 1))
+    if pattern == "random":
+        random.shuffle(keys)
+    elif pattern == "adversarial":
+        # Zig-zag from both ends towards the middle: each key lands next to the previous extreme,
+        # which turns an unbalanced BST into one long zig-zag path
+        keys = [keys[i // 2] if i % 2 == 0 else keys[count - 1 - i // 2] for i in range(count)]
+    return keys
+
+
+# Each structure is (build(keys) -> handle, search(handle, key), traverse(handle) -> iterable, close(handle))
+def suite_structures(directory):
+    store_numbers = itertools.count()
+
+    def build_bst2(keys):
+        tree = order_tree.OrderBinaryTree()
+        for key in keys:
+            tree.insert(key, "Customer", "0788000000", "Classic")
+        return tree
+
+    def build_avl3(keys):
+        tree = avl_tree.AVLTree()
+        root = None
+        for key in keys:
+            root = tree.insert(root, key, "Customer")
+        return tree, root
+
+    def build_avl4(keys):
+        tree = window_tree.AVLTree()
+        root = None
+        for key in keys:
+            root = tree.insert(root, key, "Customer", "Design", len(keys))
+        return tree, root
+
+    def build_compact(keys):
+        tree = compact_avl.CompactAVLTree()
+        for key in keys:
+            tree.insert(key, "Customer", "Design")
+        return tree
+
+    def build_persistent(keys):
+        tree = persistent_avl.PersistentAVLTree()
+        root = None
+        for key in keys:
+            root = tree.insert(root, key, "Customer", "Design")
+        return tree, root
+
+    def build_disk(keys):
+        store = disk_store.DiskOrderStore(os.path.join(directory, "suite-%d.db" % next(store_numbers)))
+        for key in keys:
+            store.insert(key, "Customer", "Design")
+        return store
+
+    def close_disk(store):
+        path = store.file.name
+        store.close()
+        os.remove(path)
+
+    def search_rooted(handle, key):
+        tree, root = handle
+        return next(tree.range(root, key, key), None)
+
+    def nothing(handle):
+        pass
+
+    return {
+        "OrderBinaryTree (2.py)": (build_bst2, lambda tree, key: tree.search(key), lambda tree: tree.in_order(), nothing),
+        "AVLTree (3.py)": (build_avl3, search_rooted, lambda handle: handle[0].walkInOrder(handle[1]), nothing),
+        "AVLTree (4.py)": (build_avl4, search_rooted, lambda handle: handle[0].walkInOrder(handle[1]), nothing),
+        "CompactAVLTree": (build_compact, lambda tree, key: tree.search(key), lambda tree: tree.preOrder([]) or (), nothing),
+        "PersistentAVLTree": (build_persistent, lambda handle, key: handle[0].search(handle[1], key), lambda handle: handle[0].walkInOrder(handle[1]), nothing),
+        "DiskOrderStore": (build_disk, lambda store, key: store.search(key), lambda store: store.range(), close_disk),
+    }
+
+
+def suite_trees(record, count, directory):
+    for structure, (build, search, traverse, close) in suite_structures(directory).items():
+        for pattern in PATTERNS:
+            keys = key_pattern(pattern, count)
+            elapsed, handle = record(structure, "insert", pattern, count, build, keys)
+            if handle is None:
+                continue
+            probes = random.choices(keys, k=min(count, SEARCH_PROBES))
+            record(structure, "search", pattern, len(probes), lambda: [search(handle, key) for key in probes])
+            record(structure, "traversal", pattern, count, lambda: sum(1 for _ in traverse(handle)))
+            close(handle)
+
+            if count <= MEMORY_LIMIT and pattern == "random":
+                tracemalloc.start()
+                handle = build(keys)
+                used = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+                close(handle)
+                record.results.append({"structure": structure, "operation": "memory", "pattern": pattern, "size": count,
+                                       "bytes_per_order": used / count})
+
+
+def suite_eviction(record, count, directory):
+    # Bounded window of a tenth of the orders: all but the last window's worth are evicted
+    window = max(1, count // 10)
+    for pattern in PATTERNS:
+        keys = key_pattern(pattern, count)
+
+        def bounded_avl(tree):
+            root = None
+            for key in keys:
+                root = tree.insert(root, key, "Customer", "Design", window)
+
+        def bounded_compact():
+            tree = compact_avl.CompactAVLTree(window)
+            for key in keys:
+                tree.insert(key, "Customer", "Design")
+
+        def dispatch_all():
+            queue = dispatch.OrderDispatchQueue(dispatch.Order(key, "Customer", key % 5 + 1) for key in keys)
+            while queue.pop_highest():
+                pass
+
+        record("AVLTree (4.py)", "eviction", pattern, count, bounded_avl, window_tree.AVLTree())
+        record("CompactAVLTree", "eviction", pattern, count, bounded_compact)
+        record("PersistentAVLTree", "eviction", pattern, count, bounded_avl, persistent_avl.PersistentAVLTree())
+        record("OrderDispatchQueue (7.py)", "dispatch", pattern, count, dispatch_all)
+
+
+def suite_sort(record, count, directory):
+    # Priorities 1-5 following the key pattern (sequential = already ascending)
+    for pattern in PATTERNS:
+        orders = [dispatch.Order(key, "Customer", 1 + (key - 1) * 5 // count) for key in key_pattern(pattern, count)]
+        for label, sort in (("merge_sort", order_sort.merge_sort), ("keyed_sort", order_sort.keyed_sort), ("counting_sort", order_sort.counting_sort)):
+            record(f"order_sort.{label}", "sort", pattern, count, lambda: sort(list(orders), descending=True))
+
+
+def suite_categories(record, count, directory):
+    # sequential = balanced four-way hierarchy, random = random parents, adversarial = one long chain
+    def add_all(pattern):
+        tree = categories.HierarchicalTree()
+        nodes = [tree.root]
+        for number in range(1, count + 1):
+            if pattern == "sequential":
+                parent = nodes[(number - 1) // 4]
+            elif pattern == "random":
+                parent = random.choice(nodes)
+            else:
+                parent = nodes[-1]
+            nodes.append(tree.add_category(parent, f"Category {number}", "", f"{number}-{number + 100}"))
+
+    for pattern in PATTERNS:
+        record("HierarchicalTree (6.py)", "category_add", pattern, count, add_all, pattern)
+
+
+SUITES = (suite_trees, suite_eviction, suite_sort, suite_categories)
+
+
+class SuiteRecorder:
+    def __init__(self):
+        self.results = []
+        self.skip = {}  # (structure, operation, pattern) -> why larger sizes are skipped
+
+    def __call__(self, structure, operation, pattern, count, function, *args):
+        # Times one case; a case that fails is recorded with its error instead of ending the run
+        key = (structure, operation, pattern)
+        entry = {"structure": structure, "operation": operation, "pattern": pattern, "size": count}
+        if key in self.skip:
+            entry["skipped"] = self.skip[key]
+            self.results.append(entry)
+            return None, None
+
+        try:
+            elapsed, result = timed(function, *args)
+        except Exception as error:
+            self.skip[key] = f"failed at size {count}"
+            entry["error"] = f"{type(error).__name__}: {error}"
+            self.results.append(entry)
+            print(f"{structure:<28} {operation:<13} {pattern:<11} {count:>9}  {entry['error']}", file=sys.stderr)
+            return None, None
+        if elapsed > SKIP_AFTER:
+            self.skip[key] = f"took over {SKIP_AFTER:.0f}s at size {count}"
+        entry["seconds"] = elapsed
+        entry["ops_per_second"] = count / elapsed if elapsed else None
+        self.results.append(entry)
+        print(f"{structure:<28} {operation:<13} {pattern:<11} {count:>9}  {elapsed:9.3f}s", file=sys.stderr)
+        return elapsed, result
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes):
+    record = SuiteRecorder()
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sorted(sizes):
+            for suite in SUITES:
+                suite(record, size, directory)
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "sizes": sorted(sizes),
+        "results": record.results,
+    }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+
+# python benchmarks.py profile <benchmark> <size>: the benchmark under cProfile, top functions by cumulative time
+def run_profile(name, size):
+    profiler = cProfile.Profile()
+    profiler.runcall(BENCHMARKS[name], size)
+    pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+
+BENCHMARKS = {
+    "bulk_load": bench_bulk_load,
+    "memory": bench_memory,
+    "refresh": bench_refresh,
+    "sort": bench_sort,
+    "phone": bench_phone,
+    "disk": bench_disk,
+    "persistent": bench_persistent,
+    "instrumented": bench_instrumented,
+    "sharded": bench_sharded,
+    "external_sort": bench_external_sort,
+}
+
+if __name__ == "__main__":
+    name = sys.argv[1] if len(sys.argv) > 1 else "bulk_load"
+    if name == "profile":
+        run_profile(sys.argv[2], int(float(sys.argv[3])))
+        sys.exit()
+
+    sizes = [int(float(size)) for size in sys.argv[2:]] or [1000, 10000, 100000]
+    if name == "suite":
+        run_suite(sizes)
+    else:
+        for size in sizes:
+            BENCHMARKS[name](size)
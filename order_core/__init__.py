@@ -0,0 +1,12 @@
+# Order data structures with no GUI dependencies; the numbered scripts are Tk front-ends over them.
+#   order_tree      OrderBinaryTree with phone and name indexes (2.py)
+#   avl_tree        AVLTree of orders by ID (3.py)
+#   window_tree     AVLTree keeping a bounded window of the newest orders (4.py, 5.py)
+#   categories      HierarchicalTree of categories with a price interval index (6.py)
+#   dispatch        Order and the OrderDispatchQueue heap (7.py)
+#   order_sort      Stable priority sorts
+#   external_sort   Parallel external merge sort for order streams larger than memory
+#   compact_avl, persistent_avl, disk_store    Alternative order stores
+#   sharded_store   Order book split across worker processes, one AVLTree per shard
+#   name_index, order_journal, order_ingest    Customer name search, durability and concurrent intake
+# Submodules are not imported here, so a worker only loads what it uses.
@@ -0,0 +1,270 @@
+import heapq
+import itertools
+
+from .name_index import CustomerNameIndex
+
+class Node:
+    __slots__ = ("orderID", "customerName", "left", "right", "height", "size")
+
+    def __init__(self, orderID, customerName):
+        self.orderID = orderID
+        self.customerName = customerName
+        self.left = None
+        self.right = None
+        self.height = 1
+        self.size = 1  # Number of orders in this subtree
+
+class AVLTree:
+    def __init__(self):
+        self.nameIndex = CustomerNameIndex()  # Customer name -> order IDs
+
+    def insert(self, root, orderID, customerName):
+        if not root:
+            self.nameIndex.add(customerName, orderID)
+            return Node(orderID, customerName)
+        
+        if orderID < root.orderID:
+            root.left = self.insert(root.left, orderID, customerName)
+        else:
+            root.right = self.insert(root.right, orderID, customerName)
+        
+        self.updateNode(root)
+        return self.rebalance(root)
+
+    def rebalance(self, root):
+        balance = self.getBalance(root)
+
+        if balance > 1:
+            if self.getBalance(root.left) < 0:
+                root.left = self.rotateLeft(root.left)
+            return self.rotateRight(root)
+
+        if balance < -1:
+            if self.getBalance(root.right) > 0:
+                root.right = self.rotateRight(root.right)
+            return self.rotateLeft(root)
+
+        return root
+    
+    def rotateLeft(self, z):
+        y = z.right
+        T2 = y.left
+        
+        y.left = z
+        z.right = T2
+        
+        self.updateNode(z)
+        self.updateNode(y)
+        
+        return y
+
+    def rotateRight(self, z):
+        y = z.left
+        T3 = y.right
+        
+        y.right = z
+        z.left = T3
+        
+        self.updateNode(z)
+        self.updateNode(y)
+        
+        return y
+    
+    def getHeight(self, root):
+        if not root:
+            return 0
+        return root.height
+    
+    def getSize(self, root):
+        if not root:
+            return 0
+        return root.size
+
+    def updateNode(self, root):
+        root.height = 1 + max(self.getHeight(root.left), self.getHeight(root.right))
+        root.size = 1 + self.getSize(root.left) + self.getSize(root.right)
+
+    def getBalance(self, root):
+        if not root:
+            return 0
+        return self.getHeight(root.left) - self.getHeight(root.right)
+
+    def countNodes(self, root):
+        return self.getSize(root)
+
+    # Order statistics from the subtree sizes, each O(log n)
+    def rank(self, root, orderID):
+        # Number of orders with a smaller orderID
+        count = 0
+        while root:
+            if orderID <= root.orderID:
+                root = root.left
+            else:
+                count += self.getSize(root.left) + 1
+                root = root.right
+        return count
+
+    def countAtMost(self, root, orderID):
+        # Number of orders with orderID <= the given one
+        count = 0
+        while root:
+            if orderID < root.orderID:
+                root = root.left
+            else:
+                count += self.getSize(root.left) + 1
+                root = root.right
+        return count
+
+    def select(self, root, k):
+        # The order with rank k (0-based) in orderID order, or None
+        while root:
+            leftSize = self.getSize(root.left)
+            if k < leftSize:
+                root = root.left
+            elif k == leftSize:
+                return root
+            else:
+                k -= leftSize + 1
+                root = root.right
+        return None
+
+    def countRange(self, root, lo, hi):
+        # Number of orders with lo <= orderID <= hi
+        if lo > hi:
+            return 0
+        return self.countAtMost(root, hi) - self.rank(root, lo)
+
+    def preOrder(self, root, result):
+        result.extend(f"Order ID: {orderID}, Customer: {customerName}" for orderID, customerName in self.preOrderIter(root))
+
+    # Iterative walks with an explicit stack, so deep trees cannot overflow Python's recursion limit
+    def walkPreOrder(self, root):
+        stack = [root] if root else []
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+
+    def walkInOrder(self, root, reverse=False):
+        stack = []
+        node = root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.right if reverse else node.left
+            node = stack.pop()
+            yield node
+            node = node.left if reverse else node.right
+
+    def walkRange(self, root, lo, hi):
+        # Only descend towards lo, then stop as soon as an orderID passes hi
+        stack = []
+        while root:
+            if root.orderID < lo:
+                root = root.right
+            else:
+                stack.append(root)
+                root = root.left
+
+        while stack:
+            node = stack.pop()
+            if node.orderID > hi:
+                return
+            yield node
+            child = node.right
+            while child:
+                stack.append(child)
+                child = child.left
+
+    def inOrderFrom(self, root, k):
+        # Yield nodes in orderID order starting at rank k, without walking the k nodes before it
+        stack = []
+        while root:
+            leftSize = self.getSize(root.left)
+            if k <= leftSize:
+                stack.append(root)
+                if k == leftSize:
+                    break
+                root = root.left
+            else:
+                k -= leftSize + 1
+                root = root.right
+
+        while stack:
+            node = stack.pop()
+            yield node
+            child = node.right
+            while child:
+                stack.append(child)
+                child = child.left
+
+    # Lazy order generators; callers can stream or page them without building the whole book
+    def preOrderIter(self, root):
+        return ((node.orderID, node.customerName) for node in self.walkPreOrder(root))
+
+    def inOrderIter(self, root):
+        return ((node.orderID, node.customerName) for node in self.walkInOrder(root))
+
+    def reverseIter(self, root):
+        return ((node.orderID, node.customerName) for node in self.walkInOrder(root, reverse=True))
+
+    def range(self, root, lo, hi):
+        # Orders with lo <= orderID <= hi, in orderID order
+        return ((node.orderID, node.customerName) for node in self.walkRange(root, lo, hi))
+
+    def firstN(self, root, n):
+        return itertools.islice(self.inOrderIter(root), n)
+
+    def lastN(self, root, n):
+        return itertools.islice(self.reverseIter(root), n)
+
+    def inOrderNodes(self, root, result):
+        result.extend(self.walkInOrder(root))
+
+    def buildBalanced(self, nodes, low, high):
+        # Link nodes[low..high] (sorted by orderID) into a perfectly balanced subtree
+        if low > high:
+            return None
+        mid = (low + high) // 2
+        root = nodes[mid]
+        root.left = self.buildBalanced(nodes, low, mid - 1)
+        root.right = self.buildBalanced(nodes, mid + 1, high)
+        self.updateNode(root)
+        return root
+
+    def bulkLoad(self, orders, presorted=False):
+        # Build a whole tree from (orderID, customerName) pairs in O(n) after one sort
+        if not presorted:
+            orders = sorted(orders, key=lambda order: order[0])
+        nodes = [Node(orderID, customerName) for orderID, customerName in orders]
+
+        # The name index follows the newly built tree
+        self.nameIndex.clear()
+        for node in nodes:
+            self.nameIndex.add(node.customerName, node.orderID)
+        return self.buildBalanced(nodes, 0, len(nodes) - 1)
+
+    def mergeBatch(self, root, orders, presorted=False):
+        if not presorted:
+            orders = sorted(orders, key=lambda order: order[0])
+        else:
+            orders = list(orders)
+
+        # A small batch into a big tree is cheaper as individual O(log n) inserts
+        size = self.getSize(root)
+        if len(orders) * max(size, 1).bit_length() < size:
+            for orderID, customerName in orders:
+                root = self.insert(root, orderID, customerName)
+            return root
+
+        # Otherwise merge the existing in-order sequence with the batch and rebuild in O(n + m)
+        existing = []
+        self.inOrderNodes(root, existing)
+        batch = [Node(orderID, customerName) for orderID, customerName in orders]
+        for node in batch:
+            self.nameIndex.add(node.customerName, node.orderID)
+        nodes = list(heapq.merge(existing, batch, key=lambda node: node.orderID))
+        return self.buildBalanced(nodes, 0, len(nodes) - 1)
@@ -0,0 +1,401 @@
+import re
+
+# Hierarchy numbering: labels start out below 2**LABEL_BITS, and a range of 2**i labels may hold
+# at most LABEL_DENSITY**i tags before it is spread out (see OrderList)
+LABEL_BITS = 62
+LABEL_DENSITY = 4 / 3
+
+# Prices such as 5000, 5,000, 12.50 or 15k / 1.5M inside a free-text price range, and an explicit
+# range of two of them ("5000-8000", "15k to 20k")
+PRICE = r"(\d[\d,]*(?:\.\d+)?)([kKmM](?![A-Za-z]))?"
+PRICE_NUMBER = re.compile(PRICE)
+PRICE_SPAN = re.compile(PRICE + r"\s*(?:-|–|\bto\b)\s*" + PRICE)
+PRICE_SUFFIXES = {"": 1, "k": 1000, "m": 1000000}
+
+# End marker for the lockstep search in categories_in_price_range
+DONE = object()
+
+def price_value(number, suffix):
+    return float(number.replace(",", "")) * PRICE_SUFFIXES[suffix.lower()]
+
+def parse_price_range(price_range):
+    # "5,000-12,000 RWF" -> (5000, 12000), "Size 2 shirts 15k-20k" -> (15000, 20000),
+    # "8000" -> (8000, 8000), "under 10000" -> (0, 10000), "from 20000" -> (20000, inf).
+    # None if there is no price, or if it is ambiguous: two ranges, or several loose numbers
+    # and no range ("2 for 5000").
+    spans = PRICE_SPAN.findall(price_range)
+    if len(spans) == 1:
+        low, high = price_value(*spans[0][:2]), price_value(*spans[0][2:])
+        return (min(low, high), max(low, high))
+    numbers = PRICE_NUMBER.findall(price_range)
+    if spans or len(numbers) != 1:
+        return None
+    price = price_value(*numbers[0])
+    text = price_range.strip().lower()
+    if text.startswith(("under", "below", "up to", "less than", "<")):
+        return (0.0, price)
+    if text.startswith(("from", "over", "above", "more than", ">")):
+        return (price, float("inf"))
+    return (price, price)
+
+# Node of the price interval tree, keyed by (low, category_id) and augmented with the largest
+# high end in its subtree
+class PriceIntervalNode:
+    def __init__(self, low, high, category):
+        self.low = low
+        self.high = high
+        self.category = category
+        self.max_high = high
+        self.left = None
+        self.right = None
+        self.height = 1
+
+# AVL interval tree over the parsed category price ranges
+class PriceIntervalTree:
+    def __init__(self):
+        self.root = None
+
+    def insert(self, low, high, category):
+        self.root = self._insert(self.root, PriceIntervalNode(low, high, category))
+
+    def remove(self, low, category):
+        self.root = self._remove(self.root, (low, category.category_id))
+
+    def overlapping(self, low, high):
+        # Categories whose range overlaps [low, high]: O(log n + matches)
+        return [category for category in self.search_steps(low, high) if category is not None]
+
+    def search_steps(self, low, high):
+        # The overlap search one visited node at a time: yields the node's category if it matches,
+        # else None. Subtrees whose max_high is below low are skipped.
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            if node.max_high < low:
+                yield None
+                continue
+            if node.left:
+                stack.append(node.left)
+            # Everything to the right starts after node.low, so stop once node.low is past high
+            if node.low <= high:
+                if node.right:
+                    stack.append(node.right)
+                if node.high >= low:
+                    yield node.category
+                    continue
+            yield None
+
+    def _key(self, node):
+        return (node.low, node.category.category_id)
+
+    def _height(self, node):
+        return node.height if node else 0
+
+    def _update(self, node):
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+        node.max_high = max(node.high, node.left.max_high if node.left else node.high, node.right.max_high if node.right else node.high)
+
+    def _rotate_left(self, z):
+        y = z.right
+        z.right = y.left
+        y.left = z
+        self._update(z)
+        self._update(y)
+        return y
+
+    def _rotate_right(self, z):
+        y = z.left
+        z.left = y.right
+        y.right = z
+        self._update(z)
+        self._update(y)
+        return y
+
+    def _rebalance(self, node):
+        self._update(node)
+        balance = self._height(node.left) - self._height(node.right)
+        if balance > 1:
+            if self._height(node.left.left) < self._height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._height(node.right.right) < self._height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+    def _insert(self, node, new_node):
+        if not node:
+            return new_node
+        if self._key(new_node) < self._key(node):
+            node.left = self._insert(node.left, new_node)
+        else:
+            node.right = self._insert(node.right, new_node)
+        return self._rebalance(node)
+
+    def _remove(self, node, key):
+        if not node:
+            return None
+        if key < self._key(node):
+            node.left = self._remove(node.left, key)
+        elif key > self._key(node):
+            node.right = self._remove(node.right, key)
+        else:
+            if not node.left or not node.right:
+                return node.left or node.right
+            # Replace with the in-order successor
+            successor = node.right
+            while successor.left:
+                successor = successor.left
+            node.right = self._remove(node.right, self._key(successor))
+            successor.left = node.left
+            successor.right = node.right
+            node = successor
+        return self._rebalance(node)
+
+# One position in an OrderList
+class OrderTag:
+    __slots__ = ("label", "prev", "next")
+
+    def __init__(self, label=0):
+        self.label = label
+        self.prev = None
+        self.next = None
+
+# Order-maintenance list: a linked list of tags whose integer labels increase along the list, so
+# two tags compare in O(1). A new tag takes the middle of the gap after its predecessor; when there
+# is no gap, the smallest aligned range of 2**i labels around it that is not over LABEL_DENSITY**i
+# tags is renumbered evenly, which is O(log n) amortized per insert. Labels stay under 2**bits, and
+# bits only grows (by a full renumbering) once the list outgrows it, so a label is O(log n) bits.
+class OrderList:
+    def __init__(self):
+        self.bits = LABEL_BITS
+        self.head = OrderTag()
+
+    def insert_after(self, tag, new=None):
+        # Link new (a fresh tag by default) right after tag and label it
+        new = new or OrderTag()
+        new.prev = tag
+        new.next = tag.next
+        if tag.next:
+            tag.next.prev = new
+        tag.next = new
+        high = new.next.label if new.next else 1 << self.bits
+        if high - tag.label > 1:
+            new.label = (tag.label + high) // 2
+        else:
+            self.spread(tag.label, new)
+        return new
+
+    def unlink(self, first, last):
+        # Take the tags from first to last out of the list; they stay linked to each other
+        first.prev.next = last.next
+        if last.next:
+            last.next.prev = first.prev
+        first.prev = None
+        last.next = None
+
+    def spread(self, label, new):
+        # Find the smallest aligned range around label that can take one more tag, then renumber it
+        first = last = new
+        count = 1
+        i = 0
+        while True:
+            i += 1
+            base = label >> i << i
+            end = base + (1 << i)
+            while first.prev and first.prev.label >= base:
+                first = first.prev
+                count += 1
+            while last.next and last.next.label < end:
+                last = last.next
+                count += 1
+            if count <= LABEL_DENSITY ** i:
+                break
+        self.bits = max(self.bits, i)
+        step = (end - base) // count
+        tag = first
+        for number in range(count):
+            tag.label = base + number * step
+            tag = tag.next
+
+# TreeNode class for hierarchical categories with more fields (e.g., "Name", "Description", "Price Range")
+class TreeNode:
+    def __init__(self, name, description="", price_range="", category_id=0):
+        self.category_id = category_id  # Stable ID; names may repeat
+        self.name = name
+        self.description = description
+        self.price_range = price_range
+        self.price_bounds = parse_price_range(price_range)  # (low, high) or None
+        self.parent = None
+        self.children = []
+
+        # Hierarchy index: the entry and exit tags of the category in an Euler tour of the
+        # hierarchy (its subtree lies between them), and jumps[k] is the 2**k-th ancestor
+        # (binary lifting for lowest common ancestor)
+        self.entry = None
+        self.exit = None
+        self.depth = 0
+        self.jumps = []
+
+    def add_child(self, child):
+        child.parent = self
+        self.children.append(child)
+
+    def remove_child(self, child):
+        child.parent = None
+        self.children.remove(child)
+
+# HierarchicalTree class to handle categories
+# Listeners are called as listener(event, node, parent) with event "add", "remove" or "move";
+# parent is the new parent for "add"/"move" and the old parent for "remove".
+class HierarchicalTree:
+    def __init__(self):
+        self.root = TreeNode("All Orders")
+        self.tour = OrderList()
+        self.root.entry = self.tour.head
+        self.root.exit = self.tour.insert_after(self.root.entry)
+        self.next_id = 1
+        self.categories = {0: self.root}  # category_id -> node
+        self.category_nodes = {"All Orders": [self.root]}  # name -> nodes with that name
+        self.price_index = PriceIntervalTree()
+        self.listeners = []
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def publish(self, event, node, parent):
+        for listener in self.listeners:
+            listener(event, node, parent)
+
+    def add_category(self, parent, name, description, price_range, category_id=None):
+        # category_id is only passed when restoring saved categories
+        if category_id is None:
+            category_id = self.next_id
+        self.next_id = max(self.next_id, category_id + 1)
+        new_node = TreeNode(name, description, price_range, category_id)
+        parent.add_child(new_node)
+        self.categories[new_node.category_id] = new_node
+        self.category_nodes.setdefault(name, []).append(new_node)
+        if new_node.price_bounds:
+            self.price_index.insert(new_node.price_bounds[0], new_node.price_bounds[1], new_node)
+        self.index_node(new_node)
+        new_node.entry = self.tour.insert_after(parent.exit.prev)
+        new_node.exit = self.tour.insert_after(new_node.entry)
+        self.publish("add", new_node, parent)
+        return new_node
+
+    def remove_category(self, node):
+        if node is self.root:
+            raise ValueError("The root category cannot be removed")
+        parent = node.parent
+        parent.remove_child(node)
+        # The subtree's tags are one run of the tour; the labels around it stay valid
+        self.tour.unlink(node.entry, node.exit)
+        for removed in self.walk(node):
+            del self.categories[removed.category_id]
+            same_name = self.category_nodes[removed.name]
+            same_name.remove(removed)
+            if not same_name:
+                del self.category_nodes[removed.name]
+            if removed.price_bounds:
+                self.price_index.remove(removed.price_bounds[0], removed)
+        self.publish("remove", node, parent)
+
+    def move_category(self, node, new_parent):
+        if node is self.root or self.is_ancestor(node, new_parent):
+            raise ValueError("A category cannot be moved under itself")
+        node.parent.remove_child(node)
+        new_parent.add_child(node)
+        # Re-index only the moved subtree and put its run of tags back, in order, just before the
+        # new parent's exit: O(s log n) amortized for s moved categories
+        for moved in self.walk(node):
+            self.index_node(moved)
+        self.tour.unlink(node.entry, node.exit)
+        tag = node.entry
+        previous = new_parent.exit.prev
+        while tag:
+            following = tag.next
+            previous = self.tour.insert_after(previous, tag)
+            tag = following
+        self.publish("move", node, new_parent)
+
+    def walk(self, node):
+        # Pre-order walk of node's subtree with an explicit stack
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(reversed(current.children))
+
+    def index_node(self, node):
+        # Depth and binary-lifting table from the (already indexed) parent: O(log n)
+        parent = node.parent
+        node.depth = parent.depth + 1
+        node.jumps = [parent]
+        while len(node.jumps[-1].jumps) >= len(node.jumps):
+            node.jumps.append(node.jumps[-1].jumps[len(node.jumps) - 1])
+
+    # Hierarchy queries
+    def is_ancestor(self, ancestor, node):
+        # True if node is ancestor or lies in its subtree: O(1)
+        return ancestor.entry.label <= node.entry.label <= ancestor.exit.label
+
+    def ancestors(self, node):
+        # Ancestor chain from the parent up to the root
+        chain = []
+        while node.parent is not None:
+            node = node.parent
+            chain.append(node)
+        return chain
+
+    def lowest_common_ancestor(self, a, b):
+        # O(log n): climb from a to the highest ancestor that does not contain b, then step to its parent
+        if self.is_ancestor(a, b):
+            return a
+        if self.is_ancestor(b, a):
+            return b
+        for k in range(len(a.jumps) - 1, -1, -1):
+            if k < len(a.jumps) and not self.is_ancestor(a.jumps[k], b):
+                a = a.jumps[k]
+        return a.parent
+
+    def categories_in_price_range(self, low, high, within=None):
+        # Categories whose price range overlaps [low, high], in hierarchy (pre-)order.
+        # Over the whole hierarchy the interval tree finds the k matches in O(log n + k), and
+        # sorting them into hierarchy order makes it O(log n + k log k). Inside a subtree of s
+        # categories, the global search (O(log n + m) for m matches anywhere) and a walk of the
+        # subtree (O(s)) advance in lockstep and the first to finish answers, so the cost is
+        # O(min(s, log n + m + k log k)): still not O(log n + k), which would need an index over
+        # hierarchy position and price together.
+        if within is None or within is self.root:
+            return sorted(self.price_index.overlapping(low, high), key=lambda node: node.entry.label)
+
+        steps = self.price_index.search_steps(low, high)
+        subtree = self.walk(within)
+        global_matches = []
+        subtree_matches = []
+        while True:
+            category = next(steps, DONE)
+            if category is DONE:
+                matches = [node for node in global_matches if self.is_ancestor(within, node)]
+                return sorted(matches, key=lambda node: node.entry.label)
+            if category is not None:
+                global_matches.append(category)
+
+            node = next(subtree, None)
+            if node is None:
+                return subtree_matches
+            bounds = node.price_bounds
+            if bounds and bounds[0] <= high and bounds[1] >= low:
+                subtree_matches.append(node)
+
+    def categories_at_price(self, price, within=None):
+        return self.categories_in_price_range(price, price, within)
+
+    def descendants(self, node):
+        # Every category below node, in pre-order
+        return [descendant for descendant in self.walk(node) if descendant is not node]
+
+    def leaf_categories(self, node):
+        return [descendant for descendant in self.walk(node) if not descendant.children]
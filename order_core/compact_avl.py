@@ -0,0 +1,214 @@
+from array import array
+
+# Index used for "no child" in the parallel arrays
+NIL = -1
+
+# AVL tree of orders stored as a struct-of-arrays arena instead of one Python object per order.
+# Node i lives at position i of every array; left/right hold child indices, and the customer name
+# and order details are references into a shared table of interned strings. Interned strings are
+# reference counted, so evicting an order frees the names and details no other order uses.
+class CompactAVLTree:
+    def __init__(self, maxOrders=None):
+        self.maxOrders = maxOrders
+        self.root = NIL
+        self.orderIDs = array('q')
+        self.left = array('i')
+        self.right = array('i')
+        self.height = array('i')
+        self.size = array('i')
+        self.customerRefs = array('i')
+        self.detailRefs = array('i')
+        self.strings = []
+        self.stringRefs = {}
+        self.stringUses = array('i')  # Orders referring to each string
+        self.freeStrings = []  # Released string slots
+        self.freeSlots = []
+
+    def internString(self, text):
+        # Each distinct customer name / detail string is stored once, however many orders use it
+        ref = self.stringRefs.get(text)
+        if ref is None:
+            if self.freeStrings:
+                ref = self.freeStrings.pop()
+                self.strings[ref] = text
+            else:
+                ref = len(self.strings)
+                self.strings.append(text)
+                self.stringUses.append(0)
+            self.stringRefs[text] = ref
+        self.stringUses[ref] += 1
+        return ref
+
+    def releaseString(self, ref):
+        self.stringUses[ref] -= 1
+        if self.stringUses[ref] == 0:
+            del self.stringRefs[self.strings[ref]]
+            self.strings[ref] = None
+            self.freeStrings.append(ref)
+
+    def newNode(self, orderID, customerName, orderDetails):
+        customerRef = self.internString(customerName)
+        detailRef = self.internString(orderDetails)
+
+        # Reuse the slot of an evicted order before growing the arrays
+        if self.freeSlots:
+            node = self.freeSlots.pop()
+            self.orderIDs[node] = orderID
+            self.left[node] = NIL
+            self.right[node] = NIL
+            self.height[node] = 1
+            self.size[node] = 1
+            self.customerRefs[node] = customerRef
+            self.detailRefs[node] = detailRef
+            return node
+
+        self.orderIDs.append(orderID)
+        self.left.append(NIL)
+        self.right.append(NIL)
+        self.height.append(1)
+        self.size.append(1)
+        self.customerRefs.append(customerRef)
+        self.detailRefs.append(detailRef)
+        return len(self.orderIDs) - 1
+
+    def getHeight(self, node):
+        if node == NIL:
+            return 0
+        return self.height[node]
+
+    def getSize(self, node):
+        if node == NIL:
+            return 0
+        return self.size[node]
+
+    def getBalance(self, node):
+        if node == NIL:
+            return 0
+        return self.getHeight(self.left[node]) - self.getHeight(self.right[node])
+
+    def updateNode(self, node):
+        left = self.left[node]
+        right = self.right[node]
+        self.height[node] = 1 + max(self.getHeight(left), self.getHeight(right))
+        self.size[node] = 1 + self.getSize(left) + self.getSize(right)
+
+    def rotateLeft(self, z):
+        y = self.right[z]
+        self.right[z] = self.left[y]
+        self.left[y] = z
+        self.updateNode(z)
+        self.updateNode(y)
+        return y
+
+    def rotateRight(self, z):
+        y = self.left[z]
+        self.left[z] = self.right[y]
+        self.right[y] = z
+        self.updateNode(z)
+        self.updateNode(y)
+        return y
+
+    def rebalance(self, node):
+        balance = self.getBalance(node)
+
+        if balance > 1:
+            if self.getBalance(self.left[node]) < 0:
+                self.left[node] = self.rotateLeft(self.left[node])
+            return self.rotateRight(node)
+
+        if balance < -1:
+            if self.getBalance(self.right[node]) > 0:
+                self.right[node] = self.rotateRight(self.right[node])
+            return self.rotateLeft(node)
+
+        return node
+
+    def fixPath(self, path):
+        # Update heights/sizes bottom-up along the search path and relink rotated subtrees
+        for index in range(len(path) - 1, -1, -1):
+            node = path[index]
+            self.updateNode(node)
+            subtree = self.rebalance(node)
+            if subtree != node:
+                if index == 0:
+                    self.root = subtree
+                elif self.left[path[index - 1]] == node:
+                    self.left[path[index - 1]] = subtree
+                else:
+                    self.right[path[index - 1]] = subtree
+
+    def insert(self, orderID, customerName, orderDetails=""):
+        node = self.newNode(orderID, customerName, orderDetails)
+
+        if self.root == NIL:
+            self.root = node
+        else:
+            path = []
+            current = self.root
+            while current != NIL:
+                path.append(current)
+                if orderID < self.orderIDs[current]:
+                    current = self.left[current]
+                else:
+                    current = self.right[current]
+
+            parent = path[-1]
+            if orderID < self.orderIDs[parent]:
+                self.left[parent] = node
+            else:
+                self.right[parent] = node
+            self.fixPath(path)
+
+        # Check for max orders and remove the oldest (smallest orderID)
+        if self.maxOrders is not None:
+            while self.countNodes() > self.maxOrders:
+                self.removeOldest()
+
+    def search(self, orderID):
+        current = self.root
+        while current != NIL:
+            currentID = self.orderIDs[current]
+            if orderID == currentID:
+                return self.getOrder(current)
+            elif orderID < currentID:
+                current = self.left[current]
+            else:
+                current = self.right[current]
+        return None
+
+    def getOrder(self, node):
+        return (self.orderIDs[node], self.strings[self.customerRefs[node]], self.strings[self.detailRefs[node]])
+
+    def removeOldest(self):
+        if self.root == NIL:
+            return None
+
+        path = []
+        current = self.root
+        while self.left[current] != NIL:
+            path.append(current)
+            current = self.left[current]
+
+        oldest = self.getOrder(current)
+        if path:
+            self.left[path[-1]] = self.right[current]
+            self.fixPath(path)
+        else:
+            self.root = self.right[current]
+        self.releaseString(self.customerRefs[current])
+        self.releaseString(self.detailRefs[current])
+        self.freeSlots.append(current)
+        return oldest
+
+    def countNodes(self):
+        return self.getSize(self.root)
+
+    def preOrder(self, result):
+        stack = [self.root] if self.root != NIL else []
+        while stack:
+            node = stack.pop()
+            result.append(self.getOrder(node))
+            if self.right[node] != NIL:
+                stack.append(self.right[node])
+            if self.left[node] != NIL:
+                stack.append(self.left[node])
@@ -0,0 +1,276 @@
+import mmap
+import os
+import struct
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+# Page 0 is the file header, so 0 also means "no page"
+NO_PAGE = 0
+FIRST_LEAF = 1
+
+MAGIC = b"ORDBTRE1"
+
+# File header: magic, page size, root page, pages in use, number of orders
+FILE_HEADER = struct.Struct("<8sIIIq")
+# Page header: leaf flag, key count, next leaf page (leaves only)
+PAGE_HEADER = struct.Struct("<BHI")
+# Leaf entry: order ID, customer name length, order details length, then both UTF-8 strings
+LEAF_ENTRY = struct.Struct("<qHH")
+KEY = struct.Struct("<q")
+CHILD = struct.Struct("<I")
+
+# A page of the B+-tree as held in the page cache. Leaves keep orderIDs in keys and
+# (customer name, order details) UTF-8 pairs in values; internal pages keep separator keys in keys
+# and child page numbers in values (one more child than keys).
+class Page:
+    __slots__ = ("number", "leaf", "keys", "values", "next", "used", "dirty")
+
+    def __init__(self, number, leaf):
+        self.number = number
+        self.leaf = leaf
+        self.keys = []
+        self.values = []
+        self.next = NO_PAGE
+        self.used = 0  # Bytes taken by leaf entries
+        self.dirty = False
+
+# Disk-backed B+-tree of orders keyed by orderID, for order books larger than RAM.
+# The file is split into fixed-size pages read and written through mmap; at most cachePages
+# decoded pages are held in an LRU cache, so resident memory stays bounded however many orders are
+# stored. With 4 KiB pages an internal page holds ~340 children, so a lookup among tens of millions
+# of orders touches 4 pages, and a range scan walks the linked leaves. Changes reach the file when
+# dirty pages leave the cache and on flush()/close(); crash safety is left to the order journal.
+class DiskOrderStore:
+    def __init__(self, path, pageSize=4096, cachePages=256):
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, "r+b" if exists else "w+b")
+        self.cachePages = cachePages
+        self.cache = OrderedDict()
+
+        if exists:
+            self.map = mmap.mmap(self.file.fileno(), 0)
+            magic, self.pageSize, self.rootPage, self.pageCount, self.orderCount = FILE_HEADER.unpack_from(self.map)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not an order store")
+        else:
+            self.pageSize = pageSize
+            self.file.truncate(pageSize * 16)
+            self.map = mmap.mmap(self.file.fileno(), 0)
+            self.rootPage = FIRST_LEAF
+            self.pageCount = 1
+            self.orderCount = 0
+            self.allocatePage(True)
+            self.flush()  # Write the header so the new file can be reopened straight away
+
+        # An internal page must hold at least 3 keys and a leaf at least 2 entries for splits to work
+        self.maxKeys = (self.pageSize - PAGE_HEADER.size - CHILD.size) // (KEY.size + CHILD.size)
+        self.leafSpace = self.pageSize - PAGE_HEADER.size
+        self.maxEntrySize = self.leafSpace // 4
+        if self.maxKeys < 3:
+            raise ValueError("pageSize is too small")
+
+    def readPage(self, number):
+        page = self.cache.get(number)
+        if page is not None:
+            self.cache.move_to_end(number)
+            return page
+
+        offset = number * self.pageSize
+        leaf, count, nextPage = PAGE_HEADER.unpack_from(self.map, offset)
+        page = Page(number, bool(leaf))
+        position = offset + PAGE_HEADER.size
+        if page.leaf:
+            page.next = nextPage
+            for _ in range(count):
+                orderID, nameLength, detailsLength = LEAF_ENTRY.unpack_from(self.map, position)
+                position += LEAF_ENTRY.size
+                name = self.map[position:position + nameLength]
+                position += nameLength
+                details = self.map[position:position + detailsLength]
+                position += detailsLength
+                page.keys.append(orderID)
+                page.values.append((name, details))
+            page.used = position - offset - PAGE_HEADER.size
+        else:
+            page.keys = list(struct.unpack_from(f"<{count}q", self.map, position))
+            position += count * KEY.size
+            page.values = list(struct.unpack_from(f"<{count + 1}I", self.map, position))
+        self.cache[number] = page
+        return page
+
+    def writePage(self, page):
+        if page.leaf:
+            parts = [PAGE_HEADER.pack(1, len(page.keys), page.next)]
+            for orderID, (name, details) in zip(page.keys, page.values):
+                parts.append(LEAF_ENTRY.pack(orderID, len(name), len(details)))
+                parts.append(name)
+                parts.append(details)
+        else:
+            count = len(page.keys)
+            parts = [PAGE_HEADER.pack(0, count, NO_PAGE), struct.pack(f"<{count}q", *page.keys), struct.pack(f"<{count + 1}I", *page.values)]
+        data = b"".join(parts)
+        offset = page.number * self.pageSize
+        self.map[offset:offset + len(data)] = data
+        page.dirty = False
+
+    def markDirty(self, page):
+        # A page evicted earlier in the same operation goes back into the cache with its changes
+        page.dirty = True
+        self.cache[page.number] = page
+        self.cache.move_to_end(page.number)
+
+    def trimCache(self):
+        # Only called between operations, so no page still being modified is evicted
+        while len(self.cache) > self.cachePages:
+            _, page = self.cache.popitem(last=False)
+            if page.dirty:
+                self.writePage(page)
+
+    def allocatePage(self, leaf):
+        number = self.pageCount
+        self.pageCount += 1
+        if self.pageCount * self.pageSize > len(self.map):
+            # Grow the file by an eighth (at least 256 pages) and remap it
+            size = len(self.map) + max(256 * self.pageSize, len(self.map) // 8 // self.pageSize * self.pageSize)
+            self.map.close()
+            self.file.truncate(size)
+            self.map = mmap.mmap(self.file.fileno(), 0)
+        page = Page(number, leaf)
+        self.markDirty(page)
+        return page
+
+    def insert(self, orderID, customerName, orderDetails=""):
+        name = customerName.encode("utf-8")
+        details = orderDetails.encode("utf-8")
+        entrySize = LEAF_ENTRY.size + len(name) + len(details)
+        if entrySize > self.maxEntrySize:
+            raise ValueError(f"Order {orderID} does not fit in a {self.pageSize}-byte page")
+
+        # Descend to the leaf, remembering the path for splits
+        path = []
+        page = self.readPage(self.rootPage)
+        while not page.leaf:
+            index = bisect_right(page.keys, orderID)
+            path.append((page, index))
+            page = self.readPage(page.values[index])
+
+        position = bisect_right(page.keys, orderID)
+        page.keys.insert(position, orderID)
+        page.values.insert(position, (name, details))
+        page.used += entrySize
+        self.markDirty(page)
+        self.orderCount += 1
+
+        if page.used > self.leafSpace:
+            key, sibling = self.splitLeaf(page, position)
+            while path:
+                parent, index = path.pop()
+                parent.keys.insert(index, key)
+                parent.values.insert(index + 1, sibling.number)
+                self.markDirty(parent)
+                if len(parent.keys) <= self.maxKeys:
+                    break
+                key, sibling = self.splitInternal(parent, index)
+            else:
+                # The root split; the tree grows one level
+                root = self.allocatePage(False)
+                root.keys = [key]
+                root.values = [self.rootPage, sibling.number]
+                self.rootPage = root.number
+        self.trimCache()
+
+    def splitLeaf(self, page, position):
+        count = len(page.keys)
+        if position == count - 1 and page.next == NO_PAGE:
+            # Appending past the largest orderID (the usual case): leave the old leaf full
+            split = count - 1
+        else:
+            # Split at the byte midpoint so both halves fit
+            split = 0
+            used = 0
+            while used < page.used // 2:
+                name, details = page.values[split]
+                used += LEAF_ENTRY.size + len(name) + len(details)
+                split += 1
+            split = min(max(split, 1), count - 1)
+
+        sibling = self.allocatePage(True)
+        sibling.keys = page.keys[split:]
+        sibling.values = page.values[split:]
+        del page.keys[split:]
+        del page.values[split:]
+        sibling.used = sum(LEAF_ENTRY.size + len(name) + len(details) for name, details in sibling.values)
+        page.used -= sibling.used
+        sibling.next = page.next
+        page.next = sibling.number
+        return sibling.keys[0], sibling
+
+    def splitInternal(self, page, index):
+        count = len(page.keys)
+        # Keep the left page full when the new separator went on the end
+        middle = count - 2 if index == count - 1 else count // 2
+
+        sibling = self.allocatePage(False)
+        key = page.keys[middle]
+        sibling.keys = page.keys[middle + 1:]
+        sibling.values = page.values[middle + 1:]
+        del page.keys[middle:]
+        del page.values[middle + 1:]
+        return key, sibling
+
+    def getOrder(self, page, index):
+        name, details = page.values[index]
+        return (page.keys[index], name.decode("utf-8"), details.decode("utf-8"))
+
+    def search(self, orderID):
+        page = self.readPage(self.rootPage)
+        while not page.leaf:
+            page = self.readPage(page.values[bisect_right(page.keys, orderID)])
+        index = bisect_left(page.keys, orderID)
+        order = self.getOrder(page, index) if index < len(page.keys) and page.keys[index] == orderID else None
+        self.trimCache()
+        return order
+
+    def range(self, low=None, high=None):
+        # Lazily yield (orderID, customerName, orderDetails) with low <= orderID <= high, by following the leaf chain
+        if low is None:
+            page = self.readPage(FIRST_LEAF)
+            index = 0
+        else:
+            # Leftmost leaf that can hold low (duplicates of a separator may sit left of it)
+            page = self.readPage(self.rootPage)
+            while not page.leaf:
+                page = self.readPage(page.values[bisect_left(page.keys, low)])
+            index = bisect_left(page.keys, low)
+
+        while True:
+            for index in range(index, len(page.keys)):
+                if high is not None and page.keys[index] > high:
+                    return
+                yield self.getOrder(page, index)
+            if page.next == NO_PAGE:
+                return
+            page = self.readPage(page.next)
+            index = 0
+            self.trimCache()
+
+    def preOrder(self, result):
+        # Orders live only in the leaves, so this lists them in orderID order
+        result.extend(self.range())
+
+    def countNodes(self):
+        return self.orderCount
+
+    def flush(self):
+        for page in self.cache.values():
+            if page.dirty:
+                self.writePage(page)
+        FILE_HEADER.pack_into(self.map, 0, MAGIC, self.pageSize, self.rootPage, self.pageCount, self.orderCount)
+        self.map.flush()
+
+    def close(self):
+        if self.map is not None:
+            self.flush()
+            self.map.close()
+            self.file.close()
+            self.map = None
@@ -0,0 +1,98 @@
+# Define Order class with attributes like order_id, customer_name, priority
+class Order:
+    def __init__(self, order_id, customer_name, priority):
+        self.order_id = order_id
+        self.customer_name = customer_name
+        self.priority = priority
+
+# Binary max-heap of orders for dispatch: highest priority first, first-come first-served within
+# a priority. position maps order_id -> heap index so priority changes and cancels are O(log n).
+class OrderDispatchQueue:
+    def __init__(self, orders=()):
+        self.heap = []  # Entries are [priority, arrival number, order]
+        self.position = {}
+        self.arrivals = 0
+        for order in orders:
+            self.push(order)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, order_id):
+        return order_id in self.position
+
+    def push(self, order):
+        if order.order_id in self.position:
+            raise ValueError(f"Order {order.order_id} is already queued")
+        self.heap.append([order.priority, self.arrivals, order])
+        self.arrivals += 1
+        self.position[order.order_id] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+
+    def peek(self):
+        if not self.heap:
+            return None
+        return self.heap[0][2]
+
+    def pop_highest(self):
+        if not self.heap:
+            return None
+        return self._remove_at(0)
+
+    def cancel(self, order_id):
+        return self._remove_at(self.position[order_id])
+
+    def change_priority(self, order_id, priority):
+        index = self.position[order_id]
+        entry = self.heap[index]
+        old_priority = entry[0]
+        entry[0] = priority
+        entry[2].priority = priority
+        if priority > old_priority:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def _before(self, i, j):
+        # True if heap[i] should be dispatched before heap[j]
+        a = self.heap[i]
+        b = self.heap[j]
+        return a[0] > b[0] or (a[0] == b[0] and a[1] < b[1])
+
+    def _swap(self, i, j):
+        heap = self.heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self.position[heap[i][2].order_id] = i
+        self.position[heap[j][2].order_id] = j
+
+    def _sift_up(self, index):
+        while index > 0:
+            parent = (index - 1) // 2
+            if not self._before(index, parent):
+                break
+            self._swap(index, parent)
+            index = parent
+
+    def _sift_down(self, index):
+        size = len(self.heap)
+        while True:
+            best = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and self._before(child, best):
+                    best = child
+            if best == index:
+                break
+            self._swap(index, best)
+            index = best
+
+    def _remove_at(self, index):
+        # Move the last entry into the hole, then restore the heap in whichever direction it needs
+        last = len(self.heap) - 1
+        if index != last:
+            self._swap(index, last)
+        order = self.heap.pop()[2]
+        del self.position[order.order_id]
+        if index < len(self.heap):
+            self._sift_up(index)
+            self._sift_down(index)
+        return order
@@ -0,0 +1,93 @@
+import heapq
+import itertools
+import os
+import shutil
+import struct
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .dispatch import Order
+from .order_sort import PRIORITY
+
+# Run file record: order ID, priority, customer name length, then the UTF-8 customer name
+RECORD = struct.Struct("<qqI")
+
+# Orders per sorted run, i.e. per chunk held in memory by a worker
+RUN_ORDERS = 100000
+# Most run files merged at once; more runs are first merged in groups into longer runs
+MERGE_FAN_IN = 64
+BUFFER_SIZE = 1 << 16
+
+
+def write_run(orders, path):
+    with open(path, "wb", buffering=BUFFER_SIZE) as f:
+        for order in orders:
+            name = order.customer_name.encode("utf-8")
+            f.write(RECORD.pack(order.order_id, order.priority, len(name)))
+            f.write(name)
+
+
+def read_run(path):
+    with open(path, "rb", buffering=BUFFER_SIZE) as f:
+        while True:
+            header = f.read(RECORD.size)
+            if not header:
+                return
+            order_id, priority, length = RECORD.unpack(header)
+            yield Order(order_id, f.read(length).decode("utf-8"), priority)
+
+
+def sort_run(orders, key, descending, path):
+    # Worker process: sort one chunk (stable, like keyed_sort) and spill it to a run file
+    orders.sort(key=key, reverse=descending)
+    write_run(orders, path)
+    return path
+
+
+def merge_runs(paths, key, descending, path):
+    # Worker process: merge consecutive runs into one longer run
+    write_run(heapq.merge(*(read_run(run) for run in paths), key=key, reverse=descending), path)
+    for run in paths:
+        os.remove(run)
+    return path
+
+
+# External merge sort for order streams larger than memory. The input is cut into chunks of
+# run_orders, a process pool sorts the chunks in parallel and writes each to a binary run file in
+# directory (the system temp directory by default), and the runs are streamed back through a
+# heap-based k-way merge. Returns a generator of Orders; at most workers + 1 chunks are in memory
+# while the runs are made, and one buffered record per run during the merge. The result is stable
+# and matches keyed_sort(list(orders), key, descending). key is sent to the workers, so it must be
+# picklable (attrgetter is, a lambda is not). Input that fits in one run is sorted in memory.
+def external_sort(orders, key=PRIORITY, descending=False, run_orders=RUN_ORDERS, workers=None, directory=None):
+    orders = iter(orders)
+    chunk = list(itertools.islice(orders, run_orders))
+    if len(chunk) < run_orders:
+        chunk.sort(key=key, reverse=descending)
+        yield from chunk
+        return
+
+    workers = workers or os.cpu_count() or 1
+    run_directory = tempfile.mkdtemp(prefix="order_runs_", dir=directory)
+    try:
+        names = (os.path.join(run_directory, f"run{number}.bin") for number in itertools.count())
+        with ProcessPoolExecutor(workers) as pool:
+            # Runs are kept in input order, which is what makes the merge stable
+            paths = []
+            running = deque()
+            while chunk:
+                if len(running) >= workers:
+                    paths.append(running.popleft().result())
+                running.append(pool.submit(sort_run, chunk, key, descending, next(names)))
+                chunk = list(itertools.islice(orders, run_orders))
+            paths.extend(future.result() for future in running)
+
+            while len(paths) > MERGE_FAN_IN:
+                groups = [paths[i:i + MERGE_FAN_IN] for i in range(0, len(paths), MERGE_FAN_IN)]
+                paths = [future.result() for future in
+                         [pool.submit(merge_runs, group, key, descending, next(names)) for group in groups]]
+
+        yield from heapq.merge(*(read_run(path) for path in paths), key=key, reverse=descending)
+    finally:
+        shutil.rmtree(run_directory, ignore_errors=True)
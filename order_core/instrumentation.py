@@ -0,0 +1,180 @@
+import math
+import time
+
+# Histogram resolution: four buckets per power of two (values within 25%), up to 2**40
+BUCKETS = 4 * 40
+
+
+def bucket_index(value):
+    # 0-3 get a bucket each; above that, the power of two and the next two bits pick the bucket
+    value = int(value)
+    if value < 4:
+        return value
+    bits = value.bit_length()
+    return min(4 * (bits - 2) + (value >> (bits - 3)) - 4, BUCKETS - 1)
+
+
+def bucket_limit(index):
+    # Largest value that falls into bucket index
+    if index < 4:
+        return index
+    bits = index // 4 + 2
+    return ((index % 4 + 5) << (bits - 3)) - 1
+
+# Log-linear histogram with a fixed number of buckets; recording is O(1) and a reader on another
+# thread can copy it at any time
+class Histogram:
+    def __init__(self):
+        self.buckets = [0] * BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value):
+        self.buckets[bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction):
+        # Upper bound of the bucket holding the given fraction of the values
+        buckets = list(self.buckets)
+        target = fraction * sum(buckets)
+        seen = 0
+        for index, count in enumerate(buckets):
+            seen += count
+            if count and seen >= target:
+                return min(bucket_limit(index), self.max)
+        return 0
+
+    def summary(self):
+        return {"count": self.count, "mean": self.mean(), "p50": self.percentile(0.5), "p99": self.percentile(0.99), "max": self.max}
+
+# Counters for one instrumented AVLTree. Latencies are in microseconds; path length is the number
+# of existing nodes an insert passes on its way down; rotations are counted per insert, including
+# the rebalancing of any evictions that insert causes.
+class TreeStats:
+    def __init__(self, tree):
+        self.tree = tree
+        self.latency = {}  # Operation name -> Histogram
+        self.rotations = 0
+        self.rotations_per_insert = Histogram()
+        self.path_length = Histogram()
+        self.evictions = 0
+        self.visits = 0  # Nodes yielded by traversals
+        self.depth = {}  # Operation name -> nesting depth, so recursive calls are timed once
+        self.current_path = 0
+        self.current_rotations = 0
+
+    def record_latency(self, operation, seconds):
+        histogram = self.latency.get(operation)
+        if histogram is None:
+            histogram = self.latency[operation] = Histogram()
+        histogram.record(seconds * 1e6)
+
+    def report(self, root=None):
+        # Plain dict of everything collected so far; with the current root it also shows how far
+        # the tree is from a perfectly balanced one of the same size
+        report = {
+            "latency_us": {operation: histogram.summary() for operation, histogram in list(self.latency.items())},
+            "rotations": self.rotations,
+            "rotations_per_insert": self.rotations_per_insert.summary(),
+            "path_length": self.path_length.summary(),
+            "evictions": self.evictions,
+            "traversal_visits": self.visits,
+        }
+        if root is not None:
+            size = self.tree.getSize(root)
+            height = self.tree.getHeight(root)
+            report["orders"] = size
+            report["height"] = height
+            report["min_height"] = math.ceil(math.log2(size + 1))
+        return report
+
+    def reset(self):
+        self.__init__(self.tree)
+
+
+# Methods wrapped per tree. Wrappers are installed on the instance only, so an uninstrumented tree
+# runs the plain class methods with no extra cost at all.
+TIMED = ("insert", "removeOldest", "preOrder", "bulkLoad", "mergeBatch")
+WALKS = ("walkPreOrder", "walkInOrder", "walkRange")
+ROTATIONS = ("rotateLeft", "rotateRight")
+
+
+def instrument(tree):
+    # Start collecting TreeStats for an AVLTree (3.py-5.py); returns the stats
+    stats = TreeStats(tree)
+    for name in TIMED:
+        if hasattr(tree, name):
+            setattr(tree, name, timed_method(stats, name, getattr(tree, name)))
+    for name in WALKS:
+        if hasattr(tree, name):
+            setattr(tree, name, counted_walk(stats, getattr(tree, name)))
+    for name in ROTATIONS:
+        setattr(tree, name, counted_rotation(stats, getattr(tree, name)))
+    if hasattr(tree, "insertNode"):
+        # 4.py/5.py: insert descends through insertNode; 3.py's insert recurses into itself
+        tree.insertNode = counted_step(stats, tree.insertNode)
+    tree.stats = stats
+    return stats
+
+
+def uninstrument(tree):
+    # Drop the wrappers so the class methods are used again
+    for name in TIMED + WALKS + ROTATIONS + ("insertNode", "stats"):
+        tree.__dict__.pop(name, None)
+
+
+def timed_method(stats, name, method):
+    def wrapper(*args, **kwargs):
+        depth = stats.depth.get(name, 0)
+        if depth:
+            # A recursive call inside the operation being timed
+            if name == "insert":
+                stats.current_path += 1
+            return method(*args, **kwargs)
+
+        stats.depth[name] = 1
+        if name == "insert":
+            stats.current_path = 0
+            stats.current_rotations = 0
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            stats.record_latency(name, time.perf_counter() - start)
+            stats.depth[name] = 0
+            if name == "insert":
+                stats.path_length.record(stats.current_path)
+                stats.rotations_per_insert.record(stats.current_rotations)
+                stats.evictions += len(getattr(stats.tree, "evicted", ()))
+    return wrapper
+
+
+def counted_step(stats, method):
+    def wrapper(root, *args):
+        if root:
+            stats.current_path += 1
+        return method(root, *args)
+    return wrapper
+
+
+def counted_rotation(stats, method):
+    def wrapper(node):
+        stats.rotations += 1
+        stats.current_rotations += 1
+        return method(node)
+    return wrapper
+
+
+def counted_walk(stats, method):
+    def wrapper(*args, **kwargs):
+        for node in method(*args, **kwargs):
+            stats.visits += 1
+            yield node
+    return wrapper
@@ -0,0 +1,135 @@
+import threading
+
+# Minimum share of trigrams a fuzzy match must have in common with the query
+FUZZY_THRESHOLD = 0.2
+
+def fold(name):
+    return " ".join(name.casefold().split())
+
+def trigrams(folded):
+    padded = f"  {folded} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# Trie node over folded customer names; orders lists the (name, order_id) pairs ending here
+class TrieNode:
+    __slots__ = ("children", "orders")
+
+    def __init__(self):
+        self.children = {}
+        self.orders = []
+
+# Secondary index from customer name to order IDs, kept up to date by the order trees on every
+# insert and eviction. Prefix search walks a trie of folded names, so an insert costs O(name
+# length) and a lookup costs O(prefix length + matches); fuzzy search ranks candidates by shared
+# name trigrams. A lock makes it safe to query from a search thread while the GUI thread inserts.
+class CustomerNameIndex:
+    def __init__(self):
+        self.root = TrieNode()
+        self.count = 0
+        self.postings = {}  # trigram -> {folded name: number of orders with that name}
+        self.names = {}  # folded name -> trie node holding its orders
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        with self.lock:
+            self.root = TrieNode()
+            self.count = 0
+            self.postings = {}
+            self.names = {}
+
+    def add(self, name, order_id):
+        folded = fold(name)
+        with self.lock:
+            node = self.names.get(folded)
+            if node is None:
+                node = self.root
+                for char in folded:
+                    node = node.children.setdefault(char, TrieNode())
+                self.names[folded] = node
+            node.orders.append((name, order_id))
+            self.count += 1
+            for trigram in trigrams(folded):
+                names = self.postings.setdefault(trigram, {})
+                names[folded] = names.get(folded, 0) + 1
+
+    def remove(self, name, order_id):
+        folded = fold(name)
+        with self.lock:
+            node = self.names.get(folded)
+            if node is None or (name, order_id) not in node.orders:
+                return
+            node.orders.remove((name, order_id))
+            self.count -= 1
+            if not node.orders:
+                # Prune the trie nodes that no longer lead to any name, so the trie only holds the
+                # live names (the window evicts orders all the time): O(name length)
+                del self.names[folded]
+                path = [self.root]
+                for char in folded:
+                    path.append(path[-1].children[char])
+                for char in reversed(folded):
+                    node = path.pop()
+                    if node.orders or node.children:
+                        break
+                    del path[-1].children[char]
+            for trigram in trigrams(folded):
+                names = self.postings[trigram]
+                names[folded] -= 1
+                if not names[folded]:
+                    del names[folded]
+                    if not names:
+                        del self.postings[trigram]
+
+    def prefix(self, text, limit=None):
+        # (name, order_id) pairs whose name starts with text, in name order
+        matches = []
+        with self.lock:
+            node = self.root
+            for char in fold(text):
+                node = node.children.get(char)
+                if node is None:
+                    return matches
+
+            stack = [node]
+            while stack and (limit is None or len(matches) < limit):
+                node = stack.pop()
+                matches.extend(node.orders)
+                stack.extend(node.children[char] for char in sorted(node.children, reverse=True))
+        return matches if limit is None else matches[:limit]
+
+    def fuzzy(self, text, limit=10):
+        # (name, order_id) pairs ranked by trigram similarity (Jaccard) to text
+        query = trigrams(fold(text))
+        shared = {}
+        with self.lock:
+            for trigram in query:
+                for folded in self.postings.get(trigram, ()):
+                    shared[folded] = shared.get(folded, 0) + 1
+
+            scored = []
+            for folded, count in shared.items():
+                score = count / (len(query) + len(trigrams(folded)) - count)
+                if score >= FUZZY_THRESHOLD:
+                    scored.append((-score, folded))
+            scored.sort()
+
+            matches = []
+            for _, folded in scored:
+                for match in self.names[folded].orders:
+                    if len(matches) == limit:
+                        return matches
+                    matches.append(match)
+        return matches
+
+    def search(self, text, limit=10):
+        # Prefix matches first, topped up with fuzzy matches for misspelled names
+        matches = self.prefix(text, limit)
+        if len(matches) < limit:
+            seen = set(matches)
+            for match in self.fuzzy(text, limit):
+                if match not in seen and len(matches) < limit:
+                    matches.append(match)
+        return matches
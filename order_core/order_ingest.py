@@ -0,0 +1,96 @@
+import queue
+import threading
+
+# Put on the pending queue to stop the writer once everything before it is applied
+STOP = object()
+
+def drain(items):
+    result = []
+    while not items.empty():
+        result.append(items.get_nowait())
+    return result
+
+# Concurrent order ingestion: any number of producer threads (the GUI, an import job, ...) submit
+# orders into a bounded queue, and a single writer thread drains it in batches and applies each
+# batch with apply_batch(orders) while holding lock. Readers take the same lock, so they always see
+# the tree between batches, never halfway through one. Whatever apply_batch returns is handed back
+# to the GUI thread through poll(), which runs on Tk's after() timer and only takes the lock when it
+# is free, so the UI thread never waits for a batch to finish. after_batch(result), if given, runs
+# on the writer thread once the lock is released, for slow work such as journaling: only the writer
+# changes the tree, so it may still read it there. A batch whose apply_batch or after_batch raises
+# is reported through poll() as (orders, error) and the writer carries on with the next one.
+class OrderIngestor:
+    def __init__(self, apply_batch, max_pending=1000, batch_size=100, after_batch=None):
+        self.apply_batch = apply_batch
+        self.after_batch = after_batch
+        self.batch_size = batch_size
+        self.pending = queue.Queue(max_pending)
+        self.applied = queue.Queue()
+        self.failed = queue.Queue()  # (orders, exception) for batches that raised
+        self.lock = threading.RLock()
+        self.writer = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.writer.start()
+
+    def submit(self, order, block=True, timeout=None):
+        # Blocks the producer while the queue is full; raises queue.Full if block is False or on timeout
+        self.pending.put(order, block, timeout)
+
+    def run(self):
+        while True:
+            order = self.pending.get()
+            if order is STOP:
+                return
+
+            # Take whatever else is already waiting, up to one batch
+            batch = [order]
+            stopping = False
+            while len(batch) < self.batch_size:
+                try:
+                    order = self.pending.get_nowait()
+                except queue.Empty:
+                    break
+                if order is STOP:
+                    stopping = True
+                    break
+                batch.append(order)
+
+            self.apply(batch)
+            if stopping:
+                return
+
+    def apply(self, batch):
+        try:
+            with self.lock:
+                result = self.apply_batch(batch)
+                self.applied.put(result)
+            if self.after_batch is not None:
+                self.after_batch(result)
+        except Exception as error:
+            self.failed.put((batch, error))
+
+    def poll(self, widget, callback, interval_ms=50, on_error=None):
+        # On the GUI thread: call callback(results) with the results of every batch applied since
+        # the last poll, in order. The lock is held during the call, so the tree matches exactly
+        # those results; if the writer is busy, try again on the next tick instead of waiting.
+        # Failed batches are then passed to on_error([(orders, error), ...]) without the lock; a
+        # failed apply_batch may have changed part of the tree, so on_error should redraw it all.
+        errors = []
+        if not (self.applied.empty() and self.failed.empty()) and self.lock.acquire(blocking=False):
+            try:
+                results = drain(self.applied)
+                errors = drain(self.failed)
+                if results:
+                    callback(results)
+            finally:
+                self.lock.release()
+        if errors and on_error is not None:
+            on_error(errors)
+        widget.after(interval_ms, self.poll, widget, callback, interval_ms, on_error)
+
+    def stop(self):
+        # Apply everything already submitted, then end the writer thread
+        if self.writer.is_alive():
+            self.pending.put(STOP)
+            self.writer.join()
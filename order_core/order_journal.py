@@ -0,0 +1,185 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+# Record kinds
+INSERT = 1           # key = order ID, fields = order fields
+EVICT = 2            # key = order ID removed (window eviction or dispatch)
+CATEGORY = 3         # key = category ID, extra = parent category ID, fields = name, description, price range
+CATEGORY_REMOVE = 4  # key = category ID
+CATEGORY_MOVE = 5    # key = category ID, extra = new parent category ID
+
+SNAPSHOT_MAGIC = b"ORDSNAP1"
+
+# Keys (order and category IDs) are stored as signed 64-bit integers
+MIN_KEY = -2 ** 63
+MAX_KEY = 2 ** 63 - 1
+
+# On disk each record is <body length><crc32 of body><body>, and the body is
+# <sequence number><kind><key><extra><field count> followed by length-prefixed UTF-8 fields
+RECORD_HEADER = struct.Struct("<II")
+BODY_HEADER = struct.Struct("<qBqqB")
+FIELD_LENGTH = struct.Struct("<I")
+SNAPSHOT_HEADER = struct.Struct("<8sq")
+
+JournalRecord = namedtuple("JournalRecord", ["kind", "key", "extra", "fields"])
+
+def check_key(key):
+    # Returns key, or raises ValueError if the journal cannot store it
+    if not MIN_KEY <= key <= MAX_KEY:
+        raise ValueError(f"ID {key} is out of range ({MIN_KEY} to {MAX_KEY})")
+    return key
+
+def encode_record(sequence, kind, key, extra, fields):
+    parts = [BODY_HEADER.pack(sequence, kind, key, extra, len(fields))]
+    for field in fields:
+        data = field.encode("utf-8")
+        parts.append(FIELD_LENGTH.pack(len(data)))
+        parts.append(data)
+    body = b"".join(parts)
+    return RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body
+
+def read_records(data):
+    # Yield (end offset, sequence number, record) for each intact record; stops at a torn or corrupt one
+    offset = 0
+    while offset + RECORD_HEADER.size <= len(data):
+        length, checksum = RECORD_HEADER.unpack_from(data, offset)
+        start = offset + RECORD_HEADER.size
+        body = data[start:start + length]
+        if len(body) < length or zlib.crc32(body) != checksum:
+            return
+        sequence, kind, key, extra, count = BODY_HEADER.unpack_from(body)
+        position = BODY_HEADER.size
+        fields = []
+        for _ in range(count):
+            (size,) = FIELD_LENGTH.unpack_from(body, position)
+            position += FIELD_LENGTH.size
+            fields.append(body[position:position + size].decode("utf-8"))
+            position += size
+        offset = start + length
+        yield offset, sequence, JournalRecord(kind, key, extra, tuple(fields))
+
+# Write-ahead journal of order and category changes, with periodic snapshots.
+# Every change is appended to journal.log; fsync is batched (every sync_every records or
+# sync_interval seconds, and on close). A background thread syncs every sync_interval seconds too,
+# so the last records of a burst reach the disk even if nothing is logged after them. Once snapshot_every records have been logged, the full
+# state from snapshot_source() is written to snapshot.bin (atomically, via a temporary file) and
+# the journal starts over, so a restart only ever replays one snapshot plus a short journal tail.
+class OrderJournal:
+    def __init__(self, directory, snapshot_source=None, snapshot_every=10000, sync_every=64, sync_interval=1.0):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.journal_path = os.path.join(directory, "journal.log")
+        self.snapshot_path = os.path.join(directory, "snapshot.bin")
+        self.snapshot_source = snapshot_source  # Returns the current state as (kind, key, extra, fields) tuples
+        self.snapshot_every = snapshot_every
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.sequence = 0
+        self.records_since_snapshot = 0
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        self.file = None
+        self.lock = threading.Lock()  # Held by log() and the background sync
+        self.closing = threading.Event()
+        self.flusher = None
+
+    def recover(self):
+        # Returns (snapshot records, journal records after the snapshot) and opens the journal for appending
+        snapshot_sequence = 0
+        snapshot = []
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "rb") as f:
+                data = f.read()
+            magic, snapshot_sequence = SNAPSHOT_HEADER.unpack_from(data)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{self.snapshot_path} is not an order snapshot")
+            snapshot = [record for _, _, record in read_records(data[SNAPSHOT_HEADER.size:])]
+
+        tail = []
+        good_offset = 0
+        self.sequence = snapshot_sequence
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb") as f:
+                data = f.read()
+            for good_offset, sequence, record in read_records(data):
+                # Records already in the snapshot survive if we crashed before the journal was reset
+                if sequence > snapshot_sequence:
+                    tail.append(record)
+                    self.sequence = sequence
+
+        # Drop a torn record left by a crash mid-write
+        self.file = open(self.journal_path, "ab")
+        self.file.truncate(good_offset)
+        self.records_since_snapshot = len(tail)
+        self.closing.clear()
+        self.flusher = threading.Thread(target=self.sync_periodically, daemon=True)
+        self.flusher.start()
+        return snapshot, tail
+
+    def sync_periodically(self):
+        while not self.closing.wait(self.sync_interval):
+            with self.lock:
+                if self.file is not None and self.unsynced:
+                    self.sync()
+
+    def log(self, kind, key, extra=0, fields=()):
+        # Raises ValueError, without writing anything, for a key or extra outside MIN_KEY..MAX_KEY
+        check_key(key)
+        check_key(extra)
+        with self.lock:
+            # Numbered under the lock, so concurrent callers never share a sequence number
+            self.sequence += 1
+            self.file.write(encode_record(self.sequence, kind, key, extra, fields))
+            self.unsynced += 1
+            self.records_since_snapshot += 1
+            if self.unsynced >= self.sync_every or time.monotonic() - self.last_sync >= self.sync_interval:
+                self.sync()
+            if self.snapshot_source is not None and self.records_since_snapshot >= self.snapshot_every:
+                self.snapshot()
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def snapshot(self):
+        self.sync()
+        temporary_path = self.snapshot_path + ".tmp"
+        with open(temporary_path, "wb") as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, self.sequence))
+            for kind, key, extra, fields in self.snapshot_source():
+                f.write(encode_record(self.sequence, kind, key, extra, fields))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary_path, self.snapshot_path)
+        self.sync_directory()
+
+        # Everything in the journal is now covered by the snapshot
+        self.file.close()
+        self.file = open(self.journal_path, "wb")
+        self.sync()
+        self.records_since_snapshot = 0
+
+    def sync_directory(self):
+        # Make the snapshot rename itself durable (not supported on Windows)
+        if hasattr(os, "O_DIRECTORY"):
+            descriptor = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
+
+    def close(self):
+        self.closing.set()
+        if self.flusher is not None:
+            self.flusher.join()
+            self.flusher = None
+        if self.file is not None:
+            self.sync()
+            self.file.close()
+            self.file = None
@@ -0,0 +1,82 @@
+from operator import attrgetter
+
+# Sort key used by the order screens
+PRIORITY = attrgetter("priority")
+
+# Runs shorter than this are insertion-sorted before the merge passes start
+RUN = 32
+
+# All sorts below are stable and sort the list in place, like list.sort(); descending=True also
+# keeps equal keys in their original order, the same way list.sort(reverse=True) does.
+
+# Bottom-up merge sort with one auxiliary buffer (no slicing per recursion level).
+# Descending walks the input backwards, sorts ascending and reverses the result.
+def merge_sort(orders, key=PRIORITY, descending=False):
+    count = len(orders)
+    if count < 2:
+        return
+
+    keys = [key(order) for order in orders]
+    index = list(range(count - 1, -1, -1)) if descending else list(range(count))
+
+    # Insertion sort each short run
+    for start in range(0, count, RUN):
+        end = min(start + RUN, count)
+        for i in range(start + 1, end):
+            item = index[i]
+            item_key = keys[item]
+            j = i - 1
+            while j >= start and keys[index[j]] > item_key:
+                index[j + 1] = index[j]
+                j -= 1
+            index[j + 1] = item
+
+    # Merge runs of doubling width, swapping the roles of index and buffer each pass
+    buffer = [0] * count
+    width = RUN
+    while width < count:
+        for low in range(0, count, 2 * width):
+            mid = min(low + width, count)
+            high = min(low + 2 * width, count)
+            i, j, k = low, mid, low
+            while i < mid and j < high:
+                if keys[index[j]] < keys[index[i]]:
+                    buffer[k] = index[j]
+                    j += 1
+                else:
+                    buffer[k] = index[i]
+                    i += 1
+                k += 1
+            while i < mid:
+                buffer[k] = index[i]
+                i += 1
+                k += 1
+            while j < high:
+                buffer[k] = index[j]
+                j += 1
+                k += 1
+        index, buffer = buffer, index
+        width *= 2
+
+    if descending:
+        index.reverse()
+    orders[:] = [orders[i] for i in index]
+
+# Timsort with each key computed once up front; the fastest of the three in CPython
+def keyed_sort(orders, key=PRIORITY, descending=False):
+    orders.sort(key=key, reverse=descending)
+
+# Counting sort for small integer key ranges: O(n + range)
+def counting_sort(orders, key=PRIORITY, descending=False):
+    if len(orders) < 2:
+        return
+
+    keys = [key(order) for order in orders]
+    low = min(keys)
+    buckets = [[] for _ in range(max(keys) - low + 1)]
+    for order, order_key in zip(orders, keys):
+        buckets[order_key - low].append(order)
+
+    if descending:
+        buckets.reverse()
+    orders[:] = [order for bucket in buckets for order in bucket]
@@ -0,0 +1,168 @@
+from .name_index import CustomerNameIndex
+
+def normalize_phone(phone_number):
+    # "+250 788-123 456" and "0788123456" are the same customer
+    digits = "".join(char for char in phone_number if char.isdigit())
+    if digits.startswith("250") and len(digits) == 12:
+        digits = "0" + digits[3:]
+    return digits
+
+# Binary Tree Node class
+class OrderNode:
+    __slots__ = ("order_id", "customer_name", "phone_number", "design", "left", "right", "height")
+
+    def __init__(self, order_id, customer_name, phone_number, design):
+        self.order_id = order_id
+        self.customer_name = customer_name
+        self.phone_number = phone_number
+        self.design = design
+        self.left = None
+        self.right = None
+        self.height = 1
+
+# Binary Tree class (self-balancing AVL, so increasing order IDs keep it O(log n) deep)
+class OrderBinaryTree:
+    def __init__(self):
+        self.root = None
+        self.name_index = CustomerNameIndex()  # Customer name -> order IDs
+        self.phone_index = {}  # Normalized phone number -> order IDs
+
+    def insert(self, order_id, customer_name, phone_number, design):
+        new_node = OrderNode(order_id, customer_name, phone_number, design)
+        self.name_index.add(customer_name, order_id)
+        self.phone_index.setdefault(normalize_phone(phone_number), []).append(order_id)
+        if not self.root:
+            self.root = new_node
+            return
+
+        # Walk down iteratively, remembering the path so we can rebalance on the way back up
+        path = []
+        current = self.root
+        while current:
+            path.append(current)
+            if order_id < current.order_id:
+                current = current.left
+            else:
+                current = current.right
+
+        parent = path[-1]
+        if order_id < parent.order_id:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+
+        self._rebalance_path(path)
+
+    def bulk_load(self, orders, presorted=False):
+        # Replace the tree with a perfectly balanced one built from (order_id, customer_name,
+        # phone_number, design) tuples: O(n) after one sort, instead of n rebalancing inserts
+        if not presorted:
+            orders = sorted(orders, key=lambda order: order[0])
+        nodes = [OrderNode(*order) for order in orders]
+
+        # The indexes follow the new tree; order IDs ascend, so each phone's list stays oldest first
+        self.name_index.clear()
+        self.phone_index = {}
+        for node in nodes:
+            self.name_index.add(node.customer_name, node.order_id)
+            self.phone_index.setdefault(normalize_phone(node.phone_number), []).append(node.order_id)
+        self.root = self._build_balanced(nodes, 0, len(nodes) - 1)
+
+    def _build_balanced(self, nodes, low, high):
+        # Link nodes[low..high] (sorted by order_id) into a balanced subtree
+        if low > high:
+            return None
+        mid = (low + high) // 2
+        node = nodes[mid]
+        node.left = self._build_balanced(nodes, low, mid - 1)
+        node.right = self._build_balanced(nodes, mid + 1, high)
+        self._update_height(node)
+        return node
+
+    def _rebalance_path(self, path):
+        # Fix heights bottom-up and rotate any node that became unbalanced
+        for index in range(len(path) - 1, -1, -1):
+            node = path[index]
+            old_height = node.height
+            self._update_height(node)
+            subtree = self._rebalance(node)
+
+            if subtree is not node:
+                if index == 0:
+                    self.root = subtree
+                elif path[index - 1].left is node:
+                    path[index - 1].left = subtree
+                else:
+                    path[index - 1].right = subtree
+
+            # A rotation after an insert restores the old height, so nothing above changes
+            if subtree.height == old_height:
+                break
+
+    def _rebalance(self, node):
+        balance = self._get_balance(node)
+        if balance > 1:
+            if self._get_balance(node.left) < 0:
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._get_balance(node.right) > 0:
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+    def _rotate_left(self, z):
+        y = z.right
+        z.right = y.left
+        y.left = z
+        self._update_height(z)
+        self._update_height(y)
+        return y
+
+    def _rotate_right(self, z):
+        y = z.left
+        z.left = y.right
+        y.right = z
+        self._update_height(z)
+        self._update_height(y)
+        return y
+
+    def _get_height(self, node):
+        if not node:
+            return 0
+        return node.height
+
+    def _get_balance(self, node):
+        if not node:
+            return 0
+        return self._get_height(node.left) - self._get_height(node.right)
+
+    def _update_height(self, node):
+        node.height = 1 + max(self._get_height(node.left), self._get_height(node.right))
+
+    def in_order(self):
+        # Orders in order ID order, iteratively
+        stack = []
+        current = self.root
+        while stack or current:
+            while current:
+                stack.append(current)
+                current = current.left
+            current = stack.pop()
+            yield current
+            current = current.right
+
+    def orders_by_phone(self, phone_number):
+        # Order IDs placed with this phone number, oldest first: one hash lookup
+        return self.phone_index.get(normalize_phone(phone_number), [])
+
+    def search(self, order_id):
+        current = self.root
+        while current:
+            if current.order_id == order_id:
+                return current
+            elif order_id < current.order_id:
+                current = current.left
+            else:
+                current = current.right
+        return None
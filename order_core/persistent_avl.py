@@ -0,0 +1,149 @@
+import itertools
+
+# Immutable AVL node: fields are set once in the constructor and never changed afterwards, so any
+# number of tree versions can share it
+class PersistentNode:
+    __slots__ = ("orderID", "customerName", "orderDetails", "left", "right", "height", "size")
+
+    def __init__(self, orderID, customerName, orderDetails, left=None, right=None):
+        self.orderID = orderID
+        self.customerName = customerName
+        self.orderDetails = orderDetails
+        self.left = left
+        self.right = right
+        self.height = 1 + max(left.height if left else 0, right.height if right else 0)
+        self.size = 1 + (left.size if left else 0) + (right.size if right else 0)
+
+# Persistent (copy-on-write) AVL tree of orders with the same root-passing interface as AVLTree in
+# 3.py-5.py. insert and removeOldest never modify a node: they copy the O(log n) nodes on the
+# search path and share every other subtree with the old version, then return the new root.
+# A root is therefore a consistent point-in-time snapshot of the book; readers on other threads
+# can keep walking it without locks while the writer publishes newer roots.
+class PersistentAVLTree:
+    def copyNode(self, node, left, right):
+        return PersistentNode(node.orderID, node.customerName, node.orderDetails, left, right)
+
+    def getHeight(self, root):
+        return root.height if root else 0
+
+    def getSize(self, root):
+        return root.size if root else 0
+
+    def balance(self, node, left, right):
+        # A copy of node over the new left/right subtrees, rotated if their heights differ by 2
+        if self.getHeight(left) > self.getHeight(right) + 1:
+            if self.getHeight(left.left) < self.getHeight(left.right):
+                # Left-right case: left.right becomes the subtree root
+                pivot = left.right
+                return self.copyNode(pivot, self.copyNode(left, left.left, pivot.left), self.copyNode(node, pivot.right, right))
+            return self.copyNode(left, left.left, self.copyNode(node, left.right, right))
+
+        if self.getHeight(right) > self.getHeight(left) + 1:
+            if self.getHeight(right.right) < self.getHeight(right.left):
+                # Right-left case: right.left becomes the subtree root
+                pivot = right.left
+                return self.copyNode(pivot, self.copyNode(node, left, pivot.left), self.copyNode(right, pivot.right, right.right))
+            return self.copyNode(right, self.copyNode(node, left, right.left), right.right)
+
+        return self.copyNode(node, left, right)
+
+    def insert(self, root, orderID, customerName, orderDetails, maxOrders=None):
+        root = self.insertNode(root, orderID, customerName, orderDetails)
+
+        # Check for max orders and remove the oldest (smallest orderID)
+        if maxOrders is not None:
+            while self.getSize(root) > maxOrders:
+                root = self.removeOldest(root)
+        return root
+
+    def insertNode(self, root, orderID, customerName, orderDetails):
+        if not root:
+            return PersistentNode(orderID, customerName, orderDetails)
+        if orderID < root.orderID:
+            return self.balance(root, self.insertNode(root.left, orderID, customerName, orderDetails), root.right)
+        return self.balance(root, root.left, self.insertNode(root.right, orderID, customerName, orderDetails))
+
+    def removeOldest(self, root):
+        # New version without the leftmost (smallest orderID) order
+        if not root.left:
+            return root.right
+        return self.balance(root, self.removeOldest(root.left), root.right)
+
+    def buildBalanced(self, orders, low, high):
+        if low > high:
+            return None
+        mid = (low + high) // 2
+        orderID, customerName, orderDetails = orders[mid]
+        return PersistentNode(orderID, customerName, orderDetails, self.buildBalanced(orders, low, mid - 1), self.buildBalanced(orders, mid + 1, high))
+
+    def bulkLoad(self, orders, presorted=False):
+        # Build a balanced version from (orderID, customerName, orderDetails) tuples in O(n) after one sort
+        orders = list(orders) if presorted else sorted(orders, key=lambda order: order[0])
+        return self.buildBalanced(orders, 0, len(orders) - 1)
+
+    def search(self, root, orderID):
+        while root:
+            if orderID == root.orderID:
+                return root
+            root = root.left if orderID < root.orderID else root.right
+        return None
+
+    def countNodes(self, root):
+        return self.getSize(root)
+
+    def rank(self, root, orderID):
+        # Number of orders with a smaller orderID
+        count = 0
+        while root:
+            if orderID <= root.orderID:
+                root = root.left
+            else:
+                count += self.getSize(root.left) + 1
+                root = root.right
+        return count
+
+    def select(self, root, k):
+        # The order with rank k (0-based) in orderID order, or None
+        while root:
+            leftSize = self.getSize(root.left)
+            if k < leftSize:
+                root = root.left
+            elif k == leftSize:
+                return root
+            else:
+                k -= leftSize + 1
+                root = root.right
+        return None
+
+    def preOrder(self, root, result):
+        result.extend(self.preOrderIter(root))
+
+    def walkPreOrder(self, root):
+        stack = [root] if root else []
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+
+    def walkInOrder(self, root, reverse=False):
+        stack = []
+        node = root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.right if reverse else node.left
+            node = stack.pop()
+            yield node
+            node = node.left if reverse else node.right
+
+    def preOrderIter(self, root):
+        return ((node.orderID, node.customerName, node.orderDetails) for node in self.walkPreOrder(root))
+
+    def inOrderIter(self, root):
+        return ((node.orderID, node.customerName, node.orderDetails) for node in self.walkInOrder(root))
+
+    def firstN(self, root, n):
+        return itertools.islice(self.inOrderIter(root), n)
@@ -0,0 +1,174 @@
+import heapq
+import itertools
+import multiprocessing
+import os
+from bisect import bisect_right
+
+from .avl_tree import AVLTree
+
+# Orders buffered for one shard before they are sent to it in a single message
+BATCH_SIZE = 1000
+# Orders fetched from each shard per message while streaming a merged listing
+PAGE_SIZE = 1000
+
+
+def shard_worker(connection):
+    # Runs in a worker process: owns one AVLTree and answers (op, args...) messages until "stop".
+    # "insert" carries a batch and has no reply, so the router never waits for a shard to write;
+    # a batch that fails is left out and the error is sent in place of the next reply instead.
+    tree = AVLTree()
+    root = None
+    failed = None
+    while True:
+        op, *args = connection.recv()
+        if op == "stop":
+            connection.close()
+            return
+
+        try:
+            if op == "insert":
+                root = tree.mergeBatch(root, args[0])
+                continue
+            if failed is not None:
+                error, failed = failed, None
+                raise RuntimeError(f"An earlier insert batch was lost: {error}")
+            if op == "search":
+                node = next(tree.walkRange(root, args[0], args[0]), None)
+                result = None if node is None else (node.orderID, node.customerName)
+            elif op == "range":
+                # Up to limit orders with low <= orderID <= high, after skipping the first skip
+                # orders with orderID == low (copies already sent on an earlier page)
+                low, high, limit, skip = args
+                nodes = itertools.takewhile(lambda node: node.orderID <= high, tree.inOrderFrom(root, tree.rank(root, low) + skip))
+                result = [(node.orderID, node.customerName) for node in itertools.islice(nodes, limit)]
+            elif op == "count":
+                result = tree.getSize(root)
+            else:
+                raise ValueError(f"Unknown op {op!r}")
+            connection.send((True, result))
+        except Exception as error:
+            if op == "insert":
+                failed = failed or f"{type(error).__name__}: {error}"
+            else:
+                connection.send((False, f"{type(error).__name__}: {error}"))
+
+
+# Order book split across worker processes by orderID, each shard owning its own AVLTree, so
+# inserts use every core instead of one. An order belongs to shard orderID % shards, or, when
+# boundaries (sorted split points, one fewer than the shards) are given, to the shard whose range
+# holds it: shard i has boundaries[i-1] <= orderID < boundaries[i]. Hashing spreads sequential IDs
+# evenly; ranges keep a range query on few shards but send sequential IDs to the last one.
+# Inserts are buffered per shard and sent BATCH_SIZE at a time without waiting for an answer; any
+# read flushes first, so it always sees every earlier insert. Point lookups go to the owning shard
+# only; range queries and the sorted listing ask every shard and k-way merge the sorted answers.
+# The router is not thread-safe: use it from one thread (e.g. the order ingestor's writer).
+class ShardedOrderStore:
+    def __init__(self, shards=None, boundaries=None):
+        if boundaries is not None:
+            self.boundaries = sorted(boundaries)
+            shards = len(self.boundaries) + 1
+        else:
+            self.boundaries = None
+            shards = shards or os.cpu_count() or 1
+
+        self.connections = []
+        self.workers = []
+        for _ in range(shards):
+            connection, child = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=shard_worker, args=(child,), daemon=True)
+            worker.start()
+            child.close()
+            self.connections.append(connection)
+            self.workers.append(worker)
+        self.pending = [[] for _ in range(shards)]  # Orders not yet sent, per shard
+
+    def shardFor(self, orderID):
+        if self.boundaries is not None:
+            return bisect_right(self.boundaries, orderID)
+        return orderID % len(self.connections)
+
+    def insert(self, orderID, customerName):
+        shard = self.shardFor(orderID)
+        pending = self.pending[shard]
+        pending.append((orderID, customerName))
+        if len(pending) >= BATCH_SIZE:
+            self.connections[shard].send(("insert", pending))
+            self.pending[shard] = []
+
+    def insertMany(self, orders):
+        for orderID, customerName in orders:
+            self.insert(orderID, customerName)
+
+    def flush(self):
+        for shard, pending in enumerate(self.pending):
+            if pending:
+                self.connections[shard].send(("insert", pending))
+                self.pending[shard] = []
+
+    def request(self, shards, *message):
+        # Send to every shard first and only then collect, so the shards work in parallel. Every
+        # reply is read before an error is raised, so none is left behind for the next request.
+        self.flush()
+        for shard in shards:
+            self.connections[shard].send(message)
+        replies = [(shard, *self.connections[shard].recv()) for shard in shards]
+        for shard, ok, result in replies:
+            if not ok:
+                raise RuntimeError(f"Shard {shard}: {result}")
+        return [result for _, _, result in replies]
+
+    def shardsFor(self, low, high):
+        if self.boundaries is None:
+            return range(len(self.connections))
+        return range(bisect_right(self.boundaries, low), bisect_right(self.boundaries, high) + 1)
+
+    def search(self, orderID):
+        # (orderID, customerName) or None
+        return self.request([self.shardFor(orderID)], "search", orderID)[0]
+
+    def countNodes(self):
+        return sum(self.request(range(len(self.connections)), "count"))
+
+    def range(self, low, high, limit=None):
+        # Orders with low <= orderID <= high in orderID order; each shard returns at most limit
+        # orders, which is all the merge can use
+        if limit is not None and (not isinstance(limit, int) or limit < 0):
+            raise ValueError(f"limit must be None or a non-negative integer, not {limit!r}")
+        if low > high:
+            return []
+        answers = self.request(self.shardsFor(low, high), "range", low, high, limit, 0)
+        return list(itertools.islice(heapq.merge(*answers), limit))
+
+    def inOrderIter(self, low=None, high=None):
+        # Every order (or those in [low, high]) in orderID order, streamed a page per shard at a
+        # time, so the router holds at most shards * PAGE_SIZE orders whatever the book size
+        low = -2 ** 63 if low is None else low
+        high = 2 ** 63 - 1 if high is None else high
+        return heapq.merge(*(self.pages(shard, low, high) for shard in self.shardsFor(low, high)))
+
+    def pages(self, shard, low, high):
+        # Pages resume at (orderID, copies of it already sent), so duplicate order IDs that cross
+        # a page boundary are neither lost nor repeated
+        skip = 0
+        while True:
+            page = self.request([shard], "range", low, high, PAGE_SIZE, skip)[0]
+            yield from page
+            if len(page) < PAGE_SIZE:
+                return
+            last = page[-1][0]
+            copies = sum(1 for orderID, _ in page if orderID == last)
+            skip = skip + copies if last == low else copies
+            low = last
+
+    def close(self):
+        # Send what is still buffered, then stop the workers; their trees go with them
+        if not self.workers:
+            return
+        self.flush()
+        for connection in self.connections:
+            connection.send(("stop",))
+        for worker in self.workers:
+            worker.join()
+        for connection in self.connections:
+            connection.close()
+        self.workers = []
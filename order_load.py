@@ -0,0 +1,93 @@
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from collections import deque
+
+from order_service import HOST, PORT
+
+# Share of each operation in the generated load
+OPERATION_MIX = (("insert", 50), ("search", 30), ("range", 15), ("dispatch", 5))
+
+order_ids = itertools.count(1)
+highest_order_id = 0  # Largest order ID sent in an insert so far
+
+
+def known_order_id():
+    # An order ID some insert has already used, so reads aim at orders that can exist
+    return random.randint(1, max(1, highest_order_id))
+
+
+def make_request(request_id):
+    global highest_order_id
+    op = random.choices([op for op, _ in OPERATION_MIX], [weight for _, weight in OPERATION_MIX])[0]
+    if op == "insert":
+        order_id = next(order_ids)
+        highest_order_id = order_id
+        return {"id": request_id, "op": "insert", "order_id": order_id, "customer_name": f"Customer {order_id % 5000}",
+                "phone": "07%08d" % random.randrange(10 ** 8), "design": "Classic", "priority": random.randint(1, 5)}
+    if op == "search":
+        return {"id": request_id, "op": "search", "order_id": known_order_id()}
+    if op == "range":
+        low = known_order_id()
+        return {"id": request_id, "op": "range", "low": low, "high": low + 50, "limit": 50}
+    return {"id": request_id, "op": "dispatch"}
+
+
+async def client(host, port, requests, depth, latencies):
+    # One connection keeping up to `depth` requests in flight; responses come back in request order
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = deque()
+    window = asyncio.Semaphore(depth)
+
+    async def send():
+        for request_id in range(requests):
+            await window.acquire()
+            sent.append(time.perf_counter())
+            writer.write(json.dumps(make_request(request_id)).encode("utf-8") + b"\n")
+            await writer.drain()
+
+    async def receive():
+        for _ in range(requests):
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("Service closed the connection")
+            latencies.append(time.perf_counter() - sent.popleft())
+            window.release()
+
+    await asyncio.gather(send(), receive())
+    writer.close()
+    await writer.wait_closed()
+
+
+def percentile(values, fraction):
+    # None if there are no values (no request got a response)
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def milliseconds(seconds):
+    return "       n/a" if seconds is None else f"{seconds * 1000:8.3f}ms"
+
+
+async def run_load(host, port, concurrency, requests_per_client, depth):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, requests_per_client, depth, latencies) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{concurrency:>5} clients  depth {depth:>3}  {len(latencies) / elapsed:10.0f} req/s  "
+          f"p50 {milliseconds(percentile(latencies, 0.50))}  p99 {milliseconds(percentile(latencies, 0.99))}")
+
+
+# Usage: python order_load.py [port] [requests per client] [pipeline depth]
+# Start the service first with: python order_service.py [port]
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else PORT
+    requests_per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    depth = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    for concurrency in (1, 4, 16, 64, 256):
+        asyncio.run(run_load(HOST, port, concurrency, requests_per_client, depth))
@@ -0,0 +1,165 @@
+import asyncio
+import itertools
+import json
+import sys
+
+from order_core.avl_tree import AVLTree
+from order_core.dispatch import Order, OrderDispatchQueue
+from order_core.order_tree import OrderBinaryTree
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+# Largest number of orders a single range request returns
+RANGE_LIMIT = 1000
+
+def error_response(request, error):
+    return {"id": request.get("id"), "ok": False, "error": f"{type(error).__name__}: {error}"}
+
+
+# Headless order intake service over the same trees the GUIs use.
+# Clients send one JSON request per line and may pipeline as many as they like; each response is
+# one JSON line with the request's "id", in request order per connection:
+#   {"id": 1, "op": "insert", "order_id": 7, "customer_name": "Ana", "phone": "0788...", "design": "Classic", "priority": 2}
+#   {"id": 2, "op": "search", "order_id": 7}
+#   {"id": 3, "op": "range", "low": 1, "high": 100, "limit": 50}
+#   {"id": 4, "op": "dispatch"}
+#   {"id": 5, "op": "count"}
+# -> {"id": 1, "ok": true, "result": ...} or {"id": 1, "ok": false, "error": "..."}
+# Requests are not handled as they arrive: everything read during one event-loop tick, from all
+# connections, is handled as a single batch, and runs of inserts go into the AVL tree together.
+class OrderService:
+    def __init__(self):
+        self.orders = OrderBinaryTree()  # Order records by ID, with the phone and name indexes
+        self.tree = AVLTree()  # Order IDs for range queries
+        self.root = None
+        self.dispatch_queue = OrderDispatchQueue()
+        self.pending = []  # (request line, writer) read since the last flush
+        self.flush_scheduled = False
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.pending.append((line, writer))
+                if not self.flush_scheduled:
+                    self.flush_scheduled = True
+                    asyncio.get_running_loop().call_soon(self.flush)
+                # Stop reading from clients that do not read their responses
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def flush(self):
+        self.flush_scheduled = False
+        batch, self.pending = self.pending, []
+
+        requests = []
+        for line, _ in batch:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError
+            except ValueError:
+                request = None
+            requests.append(request)
+
+        for (_, writer), response in zip(batch, self.handle_batch(requests)):
+            if not writer.is_closing():
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+
+    def handle_batch(self, requests):
+        responses = [None] * len(requests)
+        inserts = []  # (response index, order fields) waiting to be applied together
+
+        for index, request in enumerate(requests):
+            if request is None:
+                responses[index] = {"id": None, "ok": False, "error": "Request is not a JSON object"}
+                continue
+
+            op = request.get("op")
+            try:
+                if op == "insert":
+                    inserts.append((index, self.parse_order(request)))
+                    continue
+
+                # Reads must see every insert that arrived before them
+                self.apply_inserts(inserts, requests, responses)
+                inserts = []
+                if op == "search":
+                    result = self.search(int(request["order_id"]))
+                elif op == "range":
+                    result = self.range(int(request["low"]), int(request["high"]), int(request.get("limit", RANGE_LIMIT)))
+                elif op == "dispatch":
+                    result = self.dispatch()
+                elif op == "count":
+                    result = self.tree.countNodes(self.root)
+                else:
+                    raise ValueError(f"Unknown op {op!r}")
+                responses[index] = {"id": request.get("id"), "ok": True, "result": result}
+            except Exception as error:
+                # Any failure (e.g. OverflowError for {"order_id": 1e400}) only fails this request
+                responses[index] = error_response(request, error)
+
+        self.apply_inserts(inserts, requests, responses)
+        return responses
+
+    def parse_order(self, request):
+        return (
+            int(request["order_id"]),
+            str(request["customer_name"]),
+            str(request.get("phone", "")),
+            str(request.get("design", "")),
+            int(request.get("priority", 1)),
+        )
+
+    def apply_inserts(self, inserts, requests, responses):
+        accepted = []
+        for index, (order_id, customer_name, phone_number, design, priority) in inserts:
+            request_id = requests[index].get("id")
+            if order_id in self.dispatch_queue or self.orders.search(order_id) is not None:
+                responses[index] = {"id": request_id, "ok": False, "error": f"Order {order_id} already exists"}
+                continue
+            try:
+                self.orders.insert(order_id, customer_name, phone_number, design)
+                self.dispatch_queue.push(Order(order_id, customer_name, priority))
+            except Exception as error:
+                responses[index] = error_response(requests[index], error)
+                continue
+            accepted.append((order_id, customer_name))
+            responses[index] = {"id": request_id, "ok": True, "result": order_id}
+
+        # One merge for the whole run instead of one rebalancing insert per order
+        if accepted:
+            self.root = self.tree.mergeBatch(self.root, accepted)
+
+    def search(self, order_id):
+        node = self.orders.search(order_id)
+        if node is None:
+            return None
+        return {"order_id": node.order_id, "customer_name": node.customer_name, "phone": node.phone_number, "design": node.design}
+
+    def range(self, low, high, limit):
+        orders = itertools.islice(self.tree.range(self.root, low, high), max(0, min(limit, RANGE_LIMIT)))
+        return [[order_id, customer_name] for order_id, customer_name in orders]
+
+    def dispatch(self):
+        order = self.dispatch_queue.pop_highest()
+        if order is None:
+            return None
+        return {"order_id": order.order_id, "customer_name": order.customer_name, "priority": order.priority}
+
+    async def serve(self, host=HOST, port=PORT):
+        server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else PORT
+    print(f"Order service listening on {HOST}:{port}")
+    asyncio.run(OrderService().serve(HOST, port))
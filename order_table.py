@@ -0,0 +1,98 @@
+import tkinter as tk
+from tkinter import ttk
+
+# Virtual-scrolling order table: only the visible page of rows exists as Treeview items, and the
+# rows are fetched by rank from the backing store when the user scrolls.
+#   fetch_rows(start, count) -> list of row value tuples starting at rank `start`
+#   count_rows() -> total number of rows in the backing store
+# Either may return None while the store is busy; the table then keeps the rows it shows and
+# tries again after retry_ms.
+class VirtualOrderTable:
+    def __init__(self, parent, columns, fetch_rows, count_rows, visible_rows=10, prefetch_rows=20, retry_ms=20):
+        self.fetch_rows = fetch_rows
+        self.count_rows = count_rows
+        self.visible_rows = visible_rows
+        self.prefetch_rows = prefetch_rows
+        self.retry_ms = retry_ms
+        self.retry_scheduled = False
+        self.first = 0  # Rank of the top visible row
+        self.total = 0  # Row count at the last refresh
+        self.cache_start = 0
+        self.cache = []
+
+        self.frame = tk.Frame(parent)
+        self.tree_display = ttk.Treeview(self.frame, columns=columns, show="headings", height=visible_rows)
+        for column in columns:
+            self.tree_display.heading(column, text=column)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.on_scroll)
+        self.tree_display.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        # One Treeview item per visible row, reused for every page
+        self.items = [self.tree_display.insert("", tk.END, values=()) for _ in range(visible_rows)]
+
+        self.tree_display.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.tree_display.bind("<Button-4>", lambda event: self.scroll_to(self.first - 3))
+        self.tree_display.bind("<Button-5>", lambda event: self.scroll_to(self.first + 3))
+
+    def grid(self, **options):
+        self.frame.grid(**options)
+
+    def invalidate(self):
+        # The backing store changed; drop prefetched rows and redraw the current page
+        self.cache = []
+        self.refresh()
+
+    def page(self, start):
+        end = start + self.visible_rows
+        if not (self.cache_start <= start and end <= self.cache_start + len(self.cache)):
+            # Fetch the visible page plus a prefetch window on both sides
+            self.cache_start = max(0, start - self.prefetch_rows)
+            self.cache = self.fetch_rows(self.cache_start, self.visible_rows + 2 * self.prefetch_rows)
+            if self.cache is None:
+                self.cache = []
+                return None
+        offset = start - self.cache_start
+        return self.cache[offset:offset + self.visible_rows]
+
+    def refresh(self):
+        total = self.count_rows()
+        rows = None
+        if total is not None:
+            self.first = max(0, min(self.first, total - self.visible_rows))
+            rows = self.page(self.first)
+        if rows is None:
+            self.retry()
+            return
+        self.total = total
+
+        for index, item in enumerate(self.items):
+            self.tree_display.item(item, values=rows[index] if index < len(rows) else ())
+
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.visible_rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def retry(self):
+        if not self.retry_scheduled:
+            self.retry_scheduled = True
+            self.frame.after(self.retry_ms, self.retried)
+
+    def retried(self):
+        self.retry_scheduled = False
+        self.refresh()
+
+    def scroll_to(self, first):
+        self.first = first
+        self.refresh()
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.total))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_to(self.first + int(amount) * step)
+
+    def on_mouse_wheel(self, event):
+        self.scroll_to(self.first - 3 * (1 if event.delta > 0 else -1))
@@ -0,0 +1,198 @@
+import csv
+import itertools
+import threading
+import tkinter as tk
+from tkinter import filedialog
+from tkinter import messagebox
+from tkinter import ttk
+
+from order_core.instrumentation import instrument
+from order_core.order_ingest import OrderIngestor
+from order_core.order_journal import EVICT, INSERT, OrderJournal, check_key
+from order_core.window_tree import AVLTree
+from order_table import VirtualOrderTable
+from search_box import NameSearchBox
+from stats_panel import StatsPanel
+
+# How soon a repaint is retried while the writer holds the tree
+REPAINT_RETRY_MS = 20
+
+# Shared controller of the bounded-window order screens (4.py, 5.py): the AVLTree of the newest
+# maxOrders orders, its journal in data_directory, the ingestor's writer thread, CSV import and the
+# table refresh. create_widgets() lays out the parts every screen has; subclasses put their order
+# form in rows 0-5 of columns 0-1, then call it, and may override row_tags().
+# The GUI thread never waits for the writer: its reads only try the ingestor's lock, and while a
+# batch is being applied the virtual table is told to retry (None) and a repaint is rescheduled.
+class OrderWindowApp:
+    data_directory = None
+
+    def __init__(self, root, maxOrders=5, virtual=False, instrumented=False):
+        self.root = root
+        self.maxOrders = maxOrders
+        self.virtual = virtual  # Page rows in from the tree instead of keeping one row per order
+        self.tree = AVLTree()
+        # Per-operation latency, rotation and path-length statistics, shown in a panel (--stats)
+        self.stats = instrument(self.tree) if instrumented else None
+        self.rows = {}  # Node -> Treeview item currently showing it
+        self.journal = OrderJournal(self.data_directory, snapshot_source=self.snapshot_records)
+        self.restore_orders()
+        # Single writer thread for every order source; it journals each batch after releasing the lock
+        self.ingestor = OrderIngestor(self.apply_batch, after_batch=self.journal_batch)
+        self.window = tk.Tk()
+        self.window.title("Online Custom T-Shirt Order System")
+        self.window.state('zoomed')  # Maximize the window
+        self.window.config(bg="#f4f4f9")
+        self.create_widgets()
+        self.show_tree()
+        self.ingestor.start()
+        self.ingestor.poll(self.window, self.apply_changes, on_error=self.batch_failed)
+        self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+    def create_widgets(self):
+        # Search-as-you-type by customer name
+        self.name_search = NameSearchBox(self.window, self.tree.nameIndex, bg="#f4f4f9")
+        self.name_search.grid(row=0, column=2, rowspan=6, padx=20, sticky="n")
+
+        # Live tree statistics when the tree is instrumented
+        if self.stats:
+            self.stats_panel = StatsPanel(self.window, self.stats, lambda: self.root, bg="#f4f4f9")
+            self.stats_panel.grid(row=6, column=2, padx=20, sticky="n")
+
+        # Table of orders: self.table pages rows in, self.tree_display keeps one row per order
+        if self.virtual:
+            self.table = VirtualOrderTable(self.window, ("Order ID", "Customer Name", "Order Details"), self.fetch_rows, self.count_rows)
+            self.table.grid(row=6, column=0, columnspan=2, pady=20, padx=10)
+            return
+
+        self.tree_display = ttk.Treeview(self.window, columns=("Order ID", "Customer Name", "Order Details"), show="headings", height=10)
+        self.tree_display.heading("Order ID", text="Order ID")
+        self.tree_display.heading("Customer Name", text="Customer Name")
+        self.tree_display.heading("Order Details", text="Order Details")
+        self.tree_display.grid(row=6, column=0, columnspan=2, pady=20, padx=10)
+
+    def row_tags(self, node):
+        # Treeview tags for an order's row
+        return ()
+
+    def import_orders(self):
+        path = filedialog.askopenfilename(title="Import Orders", filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if path:
+            threading.Thread(target=self.import_file, args=(path,), daemon=True).start()
+
+    def import_file(self, path):
+        # Producer thread: one order per CSV row (order ID, customer name, order details); rows that
+        # do not parse or whose order ID is out of range are skipped. submit() blocks while the queue is full, which paces the import.
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.reader(f):
+                try:
+                    orderID, customerName, orderDetails = check_key(int(row[0])), row[1].strip(), row[2].strip()
+                except (IndexError, ValueError):
+                    continue
+                if customerName and orderDetails:
+                    self.ingestor.submit((orderID, customerName, orderDetails))
+
+    def apply_batch(self, orders):
+        # Writer thread, with the ingestor lock held; returns the (inserted, evicted) nodes for apply_changes
+        inserted = []
+        evicted = []
+        for orderID, customerName, orderDetails in orders:
+            self.root = self.tree.insert(self.root, orderID, customerName, orderDetails, self.maxOrders)
+            inserted.append(self.tree.lastInserted)
+            evicted.extend(self.tree.evicted)
+        return inserted, evicted
+
+    def batch_failed(self, errors):
+        # The writer skipped these batches, possibly after applying part of one, so redraw everything
+        self.show_tree()
+        orders = sum(len(batch) for batch, _ in errors)
+        messagebox.showerror("Order Error", f"Saving a batch of {orders} order(s) failed: {errors[-1][1]}")
+
+    def fetch_rows(self, start, count):
+        # One page of the virtual table, read from the tree by rank
+        if not self.ingestor.lock.acquire(blocking=False):
+            return None
+        try:
+            nodes = itertools.islice(self.tree.inOrderFrom(self.root, start), count)
+            return [(node.orderID, node.customerName, node.orderDetails) for node in nodes]
+        finally:
+            self.ingestor.lock.release()
+
+    def count_rows(self):
+        if not self.ingestor.lock.acquire(blocking=False):
+            return None
+        try:
+            return self.tree.countNodes(self.root)
+        finally:
+            self.ingestor.lock.release()
+
+    def apply_changes(self, batches):
+        # Called from ingestor.poll() with the lock held and the (inserted, evicted) nodes of every
+        # batch applied since the last call, so the table catches up with the tree exactly
+        if self.virtual:
+            self.table.invalidate()
+            return
+
+        # Delete the rows of evicted orders and add rows for the new ones, smallest order ID first
+        # so each rank only counts rows that are already in the table
+        inserted = [node for batch_inserted, _ in batches for node in batch_inserted]
+        evicted = [node for _, batch_evicted in batches for node in batch_evicted]
+        for node in evicted:
+            row = self.rows.pop(node, None)
+            if row is not None:
+                self.tree_display.delete(row)
+
+        evicted = set(evicted)
+        for node in sorted(inserted, key=lambda node: node.orderID):
+            if node not in evicted and node not in self.rows:
+                index = self.tree.rank(self.root, node.orderID)
+                self.rows[node] = self.tree_display.insert("", index, values=(node.orderID, node.customerName, node.orderDetails), tags=self.row_tags(node))
+
+    def show_tree(self):
+        if self.virtual:
+            self.table.invalidate()
+            return
+
+        # Full repaint on demand; inserts and evictions are applied as diffs by apply_changes
+        if not self.ingestor.lock.acquire(blocking=False):
+            self.window.after(REPAINT_RETRY_MS, self.show_tree)
+            return
+        try:
+            rows = self.tree_display.get_children()
+            if rows:
+                self.tree_display.delete(*rows)
+            self.rows = {}
+
+            # Insert rows in order ID order
+            for node in self.tree.walkInOrder(self.root):
+                self.rows[node] = self.tree_display.insert("", tk.END, values=(node.orderID, node.customerName, node.orderDetails), tags=self.row_tags(node))
+        finally:
+            self.ingestor.lock.release()
+
+    def journal_batch(self, changes):
+        # Writer thread, outside the lock, so fsyncs and snapshots never hold up the GUI.
+        # Evictions follow the inserts; replay only needs the inserts anyway (see restore_orders).
+        inserted, evicted = changes
+        for node in inserted:
+            self.journal.log(INSERT, node.orderID, fields=(node.customerName, node.orderDetails))
+        for node in evicted:
+            self.journal.log(EVICT, node.orderID)
+
+    def restore_orders(self):
+        # O(n) balanced build from the sorted snapshot, then fold in the journal tail.
+        # Evictions need no replay: the window keeps the newest maxOrders orders either way.
+        snapshot, tail = self.journal.recover()
+        self.root = self.tree.bulkLoad(((record.key, *record.fields) for record in snapshot), self.maxOrders, presorted=True)
+        self.root = self.tree.mergeBatch(self.root, [(record.key, *record.fields) for record in tail if record.kind == INSERT], self.maxOrders)
+
+    def snapshot_records(self):
+        for orderID, customerName, orderDetails in self.tree.inOrderIter(self.root):
+            yield INSERT, orderID, 0, (customerName, orderDetails)
+
+    def on_closing(self):
+        if messagebox.askyesno("Quit", "Do you want to quit?"):
+            self.ingestor.stop()
+            self.journal.close()
+            self.window.destroy()
+
+    def run(self):
+        self.window.mainloop()
@@ -0,0 +1,58 @@
+import queue
+import threading
+import tkinter as tk
+
+# Search-as-you-type box over a CustomerNameIndex. Typing is debounced, the lookup runs on a
+# worker thread, and the result is picked up with after() polling, so the Tk main loop never
+# waits on a search. Results of searches overtaken by newer keystrokes are dropped.
+class NameSearchBox:
+    def __init__(self, parent, name_index, limit=10, delay_ms=150, bg=None):
+        self.name_index = name_index
+        self.limit = limit
+        self.delay_ms = delay_ms
+        self.pending = None
+        self.generation = 0
+        self.results = queue.Queue()
+
+        self.frame = tk.Frame(parent, bg=bg)
+        tk.Label(self.frame, text="Search Customer:", font=("Arial", 12), bg=bg).grid(row=0, column=0, padx=10, pady=5, sticky="w")
+        self.entry = tk.Entry(self.frame, font=("Arial", 12))
+        self.entry.grid(row=0, column=1, padx=10, pady=5)
+        self.matches = tk.Listbox(self.frame, font=("Arial", 12), height=6, width=40)
+        self.matches.grid(row=1, column=0, columnspan=2, padx=10, pady=5)
+
+        self.entry.bind("<KeyRelease>", self.on_key)
+
+    def grid(self, **options):
+        self.frame.grid(**options)
+
+    def on_key(self, event=None):
+        if self.pending is not None:
+            self.frame.after_cancel(self.pending)
+        self.pending = self.frame.after(self.delay_ms, self.start_search)
+
+    def start_search(self):
+        self.pending = None
+        self.generation += 1
+        text = self.entry.get().strip()
+        if not text:
+            self.matches.delete(0, tk.END)
+            return
+        threading.Thread(target=self.run_search, args=(self.generation, text), daemon=True).start()
+        self.frame.after(20, self.poll_results)
+
+    def run_search(self, generation, text):
+        self.results.put((generation, self.name_index.search(text, self.limit)))
+
+    def poll_results(self):
+        try:
+            generation, matches = self.results.get_nowait()
+        except queue.Empty:
+            self.frame.after(20, self.poll_results)
+            return
+
+        # Only the newest search is shown
+        if generation == self.generation:
+            self.matches.delete(0, tk.END)
+            for name, order_id in matches:
+                self.matches.insert(tk.END, f"{name} - Order ID {order_id}")
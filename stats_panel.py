@@ -0,0 +1,39 @@
+import tkinter as tk
+
+# Operations shown in the latency rows, in this order
+PANEL_OPERATIONS = ("insert", "removeOldest", "preOrder", "mergeBatch", "bulkLoad")
+
+# Live view of an instrumented tree's TreeStats, redrawn every interval_ms with after().
+# get_root() returns the current root so the panel can compare the height with the ideal one.
+class StatsPanel:
+    def __init__(self, parent, stats, get_root, interval_ms=1000, bg=None):
+        self.stats = stats
+        self.get_root = get_root
+        self.interval_ms = interval_ms
+
+        self.frame = tk.Frame(parent, bg=bg)
+        tk.Label(self.frame, text="Tree Statistics", font=("Arial", 12, "bold"), bg=bg).grid(row=0, column=0, sticky="w")
+        self.text = tk.Label(self.frame, font=("Courier", 10), justify="left", anchor="w", bg=bg)
+        self.text.grid(row=1, column=0, sticky="w")
+
+        self.refresh()
+
+    def grid(self, **options):
+        self.frame.grid(**options)
+
+    def refresh(self):
+        report = self.stats.report(self.get_root())
+        lines = []
+        if "orders" in report:
+            lines.append(f"orders {report['orders']:>9}   height {report['height']:>3} (best {report['min_height']})")
+        rotations = report["rotations_per_insert"]
+        path = report["path_length"]
+        lines.append(f"rotations {report['rotations']:>9}   per insert {rotations['mean']:.2f} (max {rotations['max']})")
+        lines.append(f"path length mean {path['mean']:.1f}   p99 {path['p99']}   max {path['max']}")
+        lines.append(f"evictions {report['evictions']:>9}   traversal visits {report['traversal_visits']}")
+        for operation in PANEL_OPERATIONS:
+            latency = report["latency_us"].get(operation)
+            if latency:
+                lines.append(f"{operation:<13} {latency['count']:>8}x  p50 {latency['p50']:>7.0f}us  p99 {latency['p99']:>7.0f}us")
+        self.text.config(text="\n".join(lines))
+        self.frame.after(self.interval_ms, self.refresh)